@@ -1,9 +1,20 @@
-"""SortIt - Photo/Video sorting application."""
+"""SortIt - Photo/Video sorting application.
 
-from src.app import SortItApp
+Without arguments this opens the GUI; with arguments it runs the headless
+command line (see `python main.py --help`) without importing any GUI module.
+"""
+
+import sys
 
 
 def main():
+    if len(sys.argv) > 1:
+        from src.cli import main as cli_main
+
+        sys.exit(cli_main(sys.argv[1:]))
+
+    from src.app import SortItApp
+
     app = SortItApp()
     app.mainloop()
 
@@ -1,16 +1,22 @@
 """Main application window with step-based navigation."""
 
-from datetime import date
+import importlib
+import threading
+from concurrent.futures import CancelledError, Future
 from pathlib import Path
 
 import customtkinter as ctk
 
-from src.scanner import FileInfo, Group
-from src.ui.step_source import StepSource
-from src.ui.step_destination import StepDestination
-from src.ui.step_grouping import StepGrouping
-from src.ui.step_transfer import StepTransfer
+from src.catalog import Catalog
+from src.scanner import Group, SourceListing, iter_scan
 
+# (module, class) of each step, imported and built the first time it is shown.
+STEP_CLASSES = [
+    ("src.ui.step_source", "StepSource"),
+    ("src.ui.step_destination", "StepDestination"),
+    ("src.ui.step_grouping", "StepGrouping"),
+    ("src.ui.step_transfer", "StepTransfer"),
+]
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
@@ -20,12 +26,123 @@ class AppState:
     """Shared state across all steps."""
 
     def __init__(self):
-        self.source_path: str = ""
+        self.source_paths: list[str] = []
         self.photo_dest: str = ""
         self.video_dest: str = ""
         self.transfer_mode: str = "copy"  # "copy" or "move"
-        self.files_by_date: dict[date, list[FileInfo]] = {}
-        self.groups: list[Group] = []
+        self.catalog = Catalog()
+        # Listings the catalog was built from, once their scan has
+        # completed. Reused as long as the sources are unchanged.
+        self.scanned_listings: list[SourceListing] | None = None
+        self._listings: dict[str, Future] = {}
+        self._listing_lock = threading.Lock()
+        # Background scans started before the grouping step, per path, as
+        # Futures of (listing, catalog).
+        self._prescans: dict[str, Future] = {}
+
+    @property
+    def groups(self) -> list[Group]:
+        return self.catalog.groups
+
+    def listing_for(self, path: str) -> Future:
+        """Return a Future for the enumeration of path.
+
+        The enumeration runs once in the background and is shared by every
+        step. Later calls revalidate the previous listing and only re-walk
+        the tree if it changed, so the Future resolves to the very same
+        SourceListing object while the source is untouched.
+        """
+        with self._listing_lock:
+            current = self._listings.get(path)
+            if current is not None:
+                if not current.done():
+                    return current
+                previous = None if current.exception() else current.result()
+            else:
+                previous = None
+
+            future: Future = Future()
+            self._listings[path] = future
+        threading.Thread(
+            target=_load_listing, args=(future, path, previous), daemon=True
+        ).start()
+        return future
+
+    def prescan(self, path: str) -> None:
+        """Enumerate and scan path in the background, ahead of the grouping step.
+
+        A finished prescan of the same path is replaced: a card mounted where
+        another one was is a new card.
+        """
+        with self._listing_lock:
+            current = self._prescans.get(path)
+            if current is not None and not current.done():
+                return
+            future: Future = Future()
+            self._prescans[path] = future
+        listing = self.listing_for(path)
+        threading.Thread(
+            target=self._run_prescan, args=(path, future, listing), daemon=True
+        ).start()
+
+    def drop_prescans(self, *paths: str) -> None:
+        """Forget the prescans of paths, or all of them, stopping those still running."""
+        with self._listing_lock:
+            for path in paths or list(self._prescans):
+                self._prescans.pop(path, None)
+
+    def take_prescan(self, path: str, listing: SourceListing) -> Catalog | None:
+        """Catalog a prescan built from this very listing, waiting for it to finish.
+
+        A catalog is handed out once; the caller owns it from then on.
+        """
+        with self._listing_lock:
+            future = self._prescans.get(path)
+        if future is None:
+            return None
+        try:
+            scanned_listing, catalog = future.result()
+        except Exception:
+            return None
+        with self._listing_lock:
+            if self._prescans.get(path) is not future:
+                return None
+            del self._prescans[path]
+        return catalog if scanned_listing is listing else None
+
+    def _run_prescan(self, path: str, future: Future, listing_future: Future) -> None:
+        # Imported here: the cache is not needed to show the first window.
+        from src.cache import open_default_cache
+
+        future.set_running_or_notify_cancel()
+        try:
+            listing = listing_future.result()
+            catalog = Catalog()
+            cache = open_default_cache()
+            try:
+                for batch in iter_scan(
+                    listing.root, cache=cache, entries=listing.entries, store=catalog.store
+                ):
+                    if self._prescans.get(path) is not future:
+                        raise CancelledError()
+                    catalog.add(batch.files)
+            finally:
+                if cache is not None:
+                    cache.close()
+            future.set_result((listing, catalog))
+        except BaseException as e:
+            future.set_exception(e)
+
+
+def _load_listing(future: Future, path: str, previous: SourceListing | None):
+    future.set_running_or_notify_cancel()
+    try:
+        if previous is not None and not previous.is_stale():
+            future.set_result(previous)
+        else:
+            future.set_result(SourceListing.build(path))
+    except BaseException as e:
+        future.set_exception(e)
 
 
 class SortItApp(ctk.CTk):
@@ -73,25 +190,24 @@ class SortItApp(ctk.CTk):
         )
         self.btn_next.pack(side="right")
 
-        # --- Build steps ---
-        self.steps: list[ctk.CTkFrame] = []
-        self._build_steps()
+        # --- Steps, built on first use ---
+        self.steps: list[ctk.CTkFrame | None] = [None] * len(STEP_CLASSES)
         self._show_step(0)
 
-    def _build_steps(self):
-        self.steps = [
-            StepSource(self.content_frame, self.app_state),
-            StepDestination(self.content_frame, self.app_state),
-            StepGrouping(self.content_frame, self.app_state),
-            StepTransfer(self.content_frame, self.app_state),
-        ]
+    def _get_step(self, index: int) -> ctk.CTkFrame:
+        if self.steps[index] is None:
+            module_name, class_name = STEP_CLASSES[index]
+            step_class = getattr(importlib.import_module(module_name), class_name)
+            self.steps[index] = step_class(self.content_frame, self.app_state)
+        return self.steps[index]
 
     def _show_step(self, index: int):
         for step in self.steps:
-            step.pack_forget()
+            if step is not None:
+                step.pack_forget()
 
         self.current_step = index
-        step = self.steps[index]
+        step = self._get_step(index)
         step.pack(fill="both", expand=True)
 
         if hasattr(step, "on_enter"):
@@ -124,7 +240,7 @@ class SortItApp(ctk.CTk):
             self._show_step(self.current_step - 1)
 
     def _go_next(self):
-        step = self.steps[self.current_step]
+        step = self._get_step(self.current_step)
         if hasattr(step, "validate") and not step.validate():
             return
         if self.current_step < len(self.steps) - 1:
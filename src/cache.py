@@ -0,0 +1,165 @@
+"""Persistent on-disk cache of extracted file metadata."""
+
+import os
+import platform
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.filestore import from_seconds, to_seconds
+
+# Upper bound on cached files. When exceeded, the least recently used
+# entries are evicted down to EVICT_RATIO of the limit.
+DEFAULT_MAX_ENTRIES = 500_000
+EVICT_RATIO = 0.9
+
+# Bump whenever metadata extraction changes its results, so entries written
+# by an older version are discarded instead of served.
+CACHE_VERSION = 4
+
+# SQLite limits the number of bound parameters per statement.
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    taken INTEGER NOT NULL,
+    exact INTEGER NOT NULL,
+    file_type TEXT NOT NULL,
+    last_used INTEGER NOT NULL
+)
+"""
+
+
+def default_cache_dir() -> Path:
+    """Return the per-user cache directory for SortIt."""
+    system = platform.system()
+    if system == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(base) / "SortIt"
+    if system == "Darwin":
+        return Path.home() / "Library" / "Caches" / "SortIt"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "sortit"
+
+
+class ScanCache:
+    """SQLite-backed cache of (capture time, exact, file_type) per file.
+
+    exact tells a time read from the file's metadata from one that fell
+    back to its mtime. Entries are keyed by path and only returned while
+    the file's size and mtime still match, so modified or replaced files
+    are re-parsed.
+    """
+
+    def __init__(
+        self, db_path: str | Path | None = None, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        if db_path is None:
+            db_path = default_cache_dir() / "scan_cache.sqlite"
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=5, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version != CACHE_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS files")
+            self._conn.execute(f"PRAGMA user_version = {CACHE_VERSION}")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def lookup(
+        self, keys: list[tuple[str, int, int]]
+    ) -> dict[str, tuple[datetime, bool, str]]:
+        """Return cached (taken, exact, file_type) per still valid (path, size, mtime_ns)."""
+        wanted = {path: (size, mtime_ns) for path, size, mtime_ns in keys}
+        paths = list(wanted)
+        hits: dict[str, tuple[datetime, bool, str]] = {}
+        with self._lock:
+            for start in range(0, len(paths), _LOOKUP_CHUNK):
+                chunk = paths[start:start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    "SELECT path, size, mtime_ns, taken, exact, file_type FROM files "
+                    f"WHERE path IN ({placeholders})",
+                    chunk,
+                )
+                for path, size, mtime_ns, taken, exact, file_type in rows:
+                    if wanted[path] == (size, mtime_ns):
+                        hits[path] = (from_seconds(taken), bool(exact), file_type)
+            if hits:
+                now = int(time.time())
+                self._conn.executemany(
+                    "UPDATE files SET last_used = ? WHERE path = ?",
+                    ((now, path) for path in hits),
+                )
+                self._conn.commit()
+        return hits
+
+    def store(self, rows: list[tuple[str, int, int, datetime, bool, str]]) -> None:
+        """Insert or replace (path, size, mtime_ns, taken, exact, file_type) entries."""
+        if not rows:
+            return
+        now = int(time.time())
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files "
+                "(path, size, mtime_ns, taken, exact, file_type, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (path, size, mtime_ns, to_seconds(taken), exact, file_type, now)
+                    for path, size, mtime_ns, taken, exact, file_type in rows
+                ),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM files").fetchone()
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * EVICT_RATIO)
+        self._conn.execute(
+            "DELETE FROM files WHERE path IN "
+            "(SELECT path FROM files ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM files").fetchone()
+        return count
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM files")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ScanCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_default_cache() -> ScanCache | None:
+    """Open the per-user scan cache, or return None if it is unavailable."""
+    try:
+        return ScanCache()
+    except (OSError, sqlite3.Error):
+        return None
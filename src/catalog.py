@@ -0,0 +1,105 @@
+"""Scanned files indexed by date, and the groups they are assigned to."""
+
+from collections.abc import Iterable, Mapping
+from datetime import date
+
+from src.filestore import FileChain, FileList, FileStore
+from src.scanner import Group
+
+
+class Catalog:
+    """Files indexed by date, each date belonging to at most one group.
+
+    Files never move once added: a group holds date keys and reads its
+    files through a FileChain over the per-date lists. Assigning or
+    unassigning a group costs one step per date, whatever the number of
+    files, and per-date counts are kept up to date as batches arrive.
+    """
+
+    def __init__(self, store: FileStore | None = None):
+        self.store = store if store is not None else FileStore()
+        self._by_date: dict[date, FileList] = {}
+        self._owner: dict[date, Group] = {}
+        # Keyed by id() so removal is O(1); dicts keep creation order.
+        self._groups: dict[int, Group] = {}
+        self._total = 0
+
+    @classmethod
+    def from_dates(cls, files_by_date: Mapping[date, FileList]) -> "Catalog":
+        """Wrap the result of scan_directory, sharing its store."""
+        first = next(iter(files_by_date.values()), None)
+        catalog = cls(first.store if first is not None else None)
+        for files in files_by_date.values():
+            catalog.add(files)
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self._by_date)
+
+    def __contains__(self, d: date) -> bool:
+        return d in self._by_date
+
+    @property
+    def groups(self) -> list[Group]:
+        return list(self._groups.values())
+
+    @property
+    def total_files(self) -> int:
+        return self._total
+
+    def add(self, files: FileList) -> dict[date, FileList]:
+        """Index a batch of scanned files and return it split by date."""
+        parts = files.split_by_date()
+        for d, part in parts.items():
+            existing = self._by_date.get(d)
+            if existing is not None:
+                existing.extend(part)
+            else:
+                self._by_date[d] = FileList.join([part], self.store)
+            self._total += len(part)
+        return parts
+
+    def dates(self) -> list[date]:
+        return sorted(self._by_date)
+
+    def unassigned(self) -> list[date]:
+        return sorted(d for d in self._by_date if d not in self._owner)
+
+    def files(self, d: date) -> FileList:
+        return self._by_date[d]
+
+    def counts(self, d: date) -> tuple[int, int]:
+        """Return (photos, videos) for one date."""
+        return self._by_date[d].counts()
+
+    def group_of(self, d: date) -> Group | None:
+        return self._owner.get(d)
+
+    def assign(self, name: str, dates: Iterable[date]) -> Group:
+        """Create a group from unassigned dates.
+
+        Raises:
+            KeyError: a date has no files.
+            ValueError: a date already belongs to a group.
+        """
+        dates = sorted(set(dates))
+        for d in dates:
+            if d not in self._by_date:
+                raise KeyError(d)
+            owner = self._owner.get(d)
+            if owner is not None:
+                raise ValueError(f"{d.isoformat()} is already in group {owner.name!r}")
+        group = Group(
+            name=name, dates=dates, files=FileChain(self._by_date[d] for d in dates)
+        )
+        for d in dates:
+            self._owner[d] = group
+        self._groups[id(group)] = group
+        return group
+
+    def unassign(self, group: Group) -> list[date]:
+        """Delete a group and return its dates, which become unassigned."""
+        del self._groups[id(group)]
+        for d in group.dates:
+            self._owner.pop(d, None)
+        return group.dates
@@ -0,0 +1,340 @@
+"""Headless command-line mode: scan, group by rules and transfer without a display.
+
+Every line written to stdout is one JSON object with an "event" key, so
+the output can be piped into log collectors or parsed by scripts.
+Nothing here imports the GUI.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.cache import ScanCache, open_default_cache
+from src.catalog import Catalog
+from src.filestore import FileList
+from src.progress import ProgressSnapshot, TransferProgress
+from src.scanner import DEFAULT_SCAN_WORKERS, Group, count_files, scan_sources
+from src.sessions import DEFAULT_GAP, propose_groups
+from src.transfer import DEFAULT_QUEUE_CONCURRENCY, execute_transfer
+
+DEFAULT_GROUP_NAME = "Import"
+UNMATCHED_POLICIES = ("per-day", "sessions", "skip", "error")
+
+EXIT_OK = 0
+EXIT_TRANSFER_ERRORS = 1
+EXIT_USAGE = 2
+
+
+class RuleError(ValueError):
+    """A grouping rule could not be parsed or did not cover the scanned dates."""
+
+
+@dataclass(frozen=True)
+class DateRule:
+    """Files dated start..end (inclusive) go into one group called name."""
+
+    name: str
+    start: date
+    end: date
+
+    def matches(self, d: date) -> bool:
+        return self.start <= d <= self.end
+
+
+def _parse_date(text: str) -> date:
+    try:
+        return date.fromisoformat(text.strip())
+    except ValueError:
+        raise RuleError(f"invalid date {text!r}, expected YYYY-MM-DD") from None
+
+
+def _make_rule(name: str, start: date, end: date) -> DateRule:
+    name = name.strip()
+    if not name:
+        raise RuleError("group name must not be empty")
+    if end < start:
+        raise RuleError(f"range for {name!r} ends before it starts")
+    return DateRule(name, start, end)
+
+
+def parse_range(spec: str) -> DateRule:
+    """Parse "START[:END]=NAME", e.g. "2024-05-01:2024-05-03=Wedding"."""
+    dates, sep, name = spec.partition("=")
+    if not sep:
+        raise RuleError(f"invalid range {spec!r}, expected START[:END]=NAME")
+    start, _, end = dates.partition(":")
+    start_date = _parse_date(start)
+    return _make_rule(name, start_date, _parse_date(end) if end else start_date)
+
+
+def load_rules(path: str | Path) -> tuple[list[DateRule], dict]:
+    """Read a JSON rules file.
+
+    Format::
+
+        {"groups": [{"name": "Wedding", "start": "2024-05-01", "end": "2024-05-03"}],
+         "unmatched": "per-day", "name": "Import"}
+
+    "end" defaults to "start"; "unmatched" and "name" are optional and
+    returned as the second element for the caller to use as defaults.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RuleError(f"cannot read rules file {path}: {e}") from None
+    if not isinstance(data, dict):
+        raise RuleError("rules file must contain a JSON object")
+
+    rules = []
+    for entry in data.get("groups", []):
+        try:
+            start = _parse_date(entry["start"])
+            end = _parse_date(entry["end"]) if entry.get("end") else start
+            rules.append(_make_rule(entry["name"], start, end))
+        except (KeyError, TypeError, AttributeError):
+            raise RuleError(f"invalid group entry {entry!r}") from None
+    options = {key: data[key] for key in ("unmatched", "name") if key in data}
+    return rules, options
+
+
+def build_groups(
+    files_by_date: dict[date, FileList],
+    rules: list[DateRule],
+    unmatched: str = "per-day",
+    default_name: str = DEFAULT_GROUP_NAME,
+    session_gap: timedelta = DEFAULT_GAP,
+) -> tuple[list[Group], list[date]]:
+    """Assign every scanned date to a group.
+
+    A date goes to the first rule whose range contains it. Dates no rule
+    matches become one group each named default_name ("per-day"), one
+    group per shooting session split on session_gap of idle time
+    ("sessions"), are left out ("skip"), or make this raise RuleError
+    ("error").
+
+    Returns:
+        The groups, in rule order then date order, and the skipped dates.
+    """
+    if unmatched not in UNMATCHED_POLICIES:
+        raise RuleError(f"unknown unmatched policy {unmatched!r}")
+
+    by_rule: dict[int, list[date]] = {}
+    leftover: list[date] = []
+    for d in sorted(files_by_date):
+        index = next((i for i, rule in enumerate(rules) if rule.matches(d)), None)
+        if index is None:
+            leftover.append(d)
+        else:
+            by_rule.setdefault(index, []).append(d)
+
+    if leftover and unmatched == "error":
+        listed = ", ".join(d.isoformat() for d in leftover)
+        raise RuleError(f"no rule matches these dates: {listed}")
+
+    catalog = Catalog.from_dates(files_by_date)
+    for index in sorted(by_rule):
+        catalog.assign(rules[index].name, by_rule[index])
+    if unmatched == "per-day":
+        for d in leftover:
+            catalog.assign(default_name, [d])
+        leftover = []
+    elif unmatched == "sessions":
+        for proposal in propose_groups(catalog, session_gap, leftover):
+            catalog.assign(default_name, proposal.dates)
+        leftover = []
+    return catalog.groups, leftover
+
+
+def _emit(event: str, **fields) -> None:
+    print(json.dumps({"event": event, **fields}, ensure_ascii=False), flush=True)
+
+
+def _emit_progress(snapshot: ProgressSnapshot) -> None:
+    if snapshot.finished:
+        return
+    _emit(
+        "progress",
+        files_done=snapshot.files_done,
+        files_total=snapshot.files_total,
+        bytes_done=snapshot.bytes_done,
+        bytes_total=snapshot.bytes_total,
+        rate=round(snapshot.rate) if snapshot.rate is not None else None,
+        eta=round(snapshot.eta, 1) if snapshot.eta is not None else None,
+    )
+
+
+def _group_fields(group: Group) -> dict:
+    photos, videos = group.counts()
+    return {
+        "name": group.name,
+        "dates": [d.isoformat() for d in group.dates],
+        "photos": photos,
+        "videos": videos,
+    }
+
+
+def _cmd_ingest(args: argparse.Namespace) -> int:
+    sources = [Path(source) for source in args.sources]
+    for source in sources:
+        if not source.is_dir():
+            _emit("error", message=f"source is not a directory: {source}")
+            return EXIT_USAGE
+
+    try:
+        rules, options = load_rules(args.rules) if args.rules else ([], {})
+        rules += [parse_range(spec) for spec in args.range]
+    except RuleError as e:
+        _emit("error", message=str(e))
+        return EXIT_USAGE
+    unmatched = args.unmatched or options.get("unmatched") or (
+        "error" if rules else "per-day"
+    )
+    name = args.name or options.get("name") or DEFAULT_GROUP_NAME
+
+    cache = None if args.no_cache else open_default_cache()
+    try:
+        files_by_date = scan_sources(sources, workers=args.workers, cache=cache)
+    except OSError as e:
+        _emit("error", message=f"cannot scan sources: {e}")
+        return EXIT_USAGE
+    finally:
+        if cache is not None:
+            cache.close()
+    photos, videos = count_files(files_by_date)
+    _emit(
+        "scan",
+        sources=[str(source) for source in sources],
+        dates=len(files_by_date),
+        photos=photos,
+        videos=videos,
+    )
+
+    try:
+        groups, skipped_dates = build_groups(
+            files_by_date, rules, unmatched, name, timedelta(hours=args.session_gap)
+        )
+    except RuleError as e:
+        _emit("error", message=str(e))
+        return EXIT_USAGE
+    for group in groups:
+        _emit("group", **_group_fields(group))
+    if skipped_dates:
+        _emit("unmatched", dates=[d.isoformat() for d in skipped_dates])
+    if args.dry_run or not groups:
+        return EXIT_OK
+
+    try:
+        result = execute_transfer(
+            groups,
+            photo_dest=args.photos,
+            video_dest=args.videos or args.photos,
+            mode="move" if args.move else "copy",
+            concurrency=args.concurrency,
+            resume=not args.no_resume,
+            verify=not args.no_verify,
+            progress=TransferProgress(_emit_progress, interval=args.progress_interval),
+        )
+    except OSError as e:
+        _emit("error", message=f"transfer failed: {e}")
+        return EXIT_TRANSFER_ERRORS
+    _emit(
+        "result",
+        transferred=result["transferred"],
+        skipped=result["skipped"],
+        duplicates=result["duplicates"],
+        errors=[{"file": filename, "error": err} for filename, err in result["errors"]],
+    )
+    return EXIT_TRANSFER_ERRORS if result["errors"] else EXIT_OK
+
+
+def _cmd_clear_cache(args: argparse.Namespace) -> int:
+    # Imported here so that ingest never loads the imaging stack.
+    from src.thumbnails import ThumbnailDiskCache
+
+    try:
+        with ScanCache() as cache:
+            entries = len(cache)
+            cache.clear()
+        ThumbnailDiskCache().clear()
+    except Exception as e:
+        _emit("error", message=f"cannot clear cache: {e}")
+        return EXIT_USAGE
+    _emit("cache_cleared", entries=entries)
+    return EXIT_OK
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="sortit",
+        description="Sort photos and videos into dated folders without the GUI.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="scan a source and transfer its files")
+    ingest.add_argument(
+        "sources",
+        nargs="+",
+        metavar="SOURCE",
+        help="cards or folders to read from, scanned and transferred in parallel",
+    )
+    ingest.add_argument("--photos", required=True, help="destination for photos")
+    ingest.add_argument("--videos", help="destination for videos (default: --photos)")
+    ingest.add_argument("--move", action="store_true", help="move instead of copy")
+    ingest.add_argument(
+        "--range",
+        action="append",
+        default=[],
+        metavar="START[:END]=NAME",
+        help="group the dates in this range under NAME (repeatable)",
+    )
+    ingest.add_argument("--rules", metavar="FILE", help="JSON file of grouping rules")
+    ingest.add_argument(
+        "--unmatched",
+        choices=UNMATCHED_POLICIES,
+        help="what to do with dates no rule matches "
+        "(default: per-day without rules, error with them)",
+    )
+    ingest.add_argument(
+        "--session-gap",
+        type=float,
+        default=DEFAULT_GAP.total_seconds() / 3600,
+        metavar="HOURS",
+        help="idle time that ends a session with --unmatched sessions",
+    )
+    ingest.add_argument(
+        "--name",
+        help=f"name of per-day and session groups (default: {DEFAULT_GROUP_NAME})",
+    )
+    ingest.add_argument(
+        "--dry-run", action="store_true", help="print the groups without transferring"
+    )
+    ingest.add_argument("--workers", type=int, default=DEFAULT_SCAN_WORKERS)
+    ingest.add_argument("--concurrency", type=int, default=DEFAULT_QUEUE_CONCURRENCY)
+    ingest.add_argument("--no-verify", action="store_true", help="skip SHA-256 checks")
+    ingest.add_argument("--no-resume", action="store_true", help="do not keep a journal")
+    ingest.add_argument("--no-cache", action="store_true", help="ignore the scan cache")
+    ingest.add_argument(
+        "--progress-interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="minimum time between progress lines",
+    )
+    ingest.set_defaults(handler=_cmd_ingest)
+
+    clear = commands.add_parser("clear-cache", help="empty the scan and thumbnail caches")
+    clear.set_defaults(handler=_cmd_clear_cache)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
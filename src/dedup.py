@@ -0,0 +1,74 @@
+"""Tiered content comparison for spotting files that are already imported."""
+
+import hashlib
+import os
+from pathlib import Path
+
+# Bytes hashed at each end of a file for the partial comparison.
+PARTIAL_BYTES = 64 * 1024
+HASH_CHUNK = 1024 * 1024
+
+
+def partial_hash(path: str | Path, size: int) -> bytes:
+    """Hash the first and last PARTIAL_BYTES of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        digest.update(f.read(PARTIAL_BYTES))
+        if size > 2 * PARTIAL_BYTES:
+            f.seek(size - PARTIAL_BYTES)
+        digest.update(f.read(PARTIAL_BYTES))
+    return digest.digest()
+
+
+def full_hash(path: str | Path) -> bytes:
+    """SHA-256 of a whole file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK):
+            digest.update(chunk)
+    return digest.digest()
+
+
+class ContentComparer:
+    """Compare files by size, then head/tail hash, then full hash.
+
+    Each tier only runs when the cheaper one before it matched, and hashes
+    are memoized per path, so a file compared against several candidates is
+    read at most once per tier.
+    """
+
+    def __init__(self):
+        self._sizes: dict[str, int] = {}
+        self._partial: dict[str, bytes] = {}
+        self._full: dict[str, bytes] = {}
+
+    def _size(self, path: str) -> int:
+        if path not in self._sizes:
+            self._sizes[path] = os.stat(path).st_size
+        return self._sizes[path]
+
+    def _partial_hash(self, path: str) -> bytes:
+        if path not in self._partial:
+            self._partial[path] = partial_hash(path, self._size(path))
+        return self._partial[path]
+
+    def _full_hash(self, path: str) -> bytes:
+        if path not in self._full:
+            self._full[path] = full_hash(path)
+        return self._full[path]
+
+    def same(self, a: str | Path, b: str | Path) -> bool:
+        """Return True if both files exist and have identical content."""
+        a, b = os.fspath(a), os.fspath(b)
+        try:
+            size = self._size(a)
+            if size != self._size(b):
+                return False
+            if self._partial_hash(a) != self._partial_hash(b):
+                return False
+            if size <= 2 * PARTIAL_BYTES:
+                # The partial hash already covered every byte.
+                return True
+            return self._full_hash(a) == self._full_hash(b)
+        except OSError:
+            return False
@@ -0,0 +1,261 @@
+"""Compact, column-oriented storage for scanned files."""
+
+import os
+import threading
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# file_type is stored as one byte per file.
+_TYPE_CODES = {"photo": 0, "video": 1}
+_TYPE_NAMES = ("photo", "video")
+
+SECONDS_PER_DAY = 86400
+
+
+def to_seconds(moment: date) -> int:
+    """Seconds since 0001-01-01 00:00 of a naive datetime, or of a date's midnight."""
+    seconds = moment.toordinal() * SECONDS_PER_DAY
+    if isinstance(moment, datetime):
+        seconds += moment.hour * 3600 + moment.minute * 60 + moment.second
+    return seconds
+
+
+def from_seconds(seconds: int) -> datetime:
+    days, rest = divmod(seconds, SECONDS_PER_DAY)
+    return datetime.fromordinal(days) + timedelta(seconds=rest)
+
+
+@dataclass(slots=True)
+class FileInfo:
+    path: Path
+    filename: str
+    date: date
+    file_type: str  # "photo" or "video"
+    size: int
+    # Capture time, to the second; None when only the date is known.
+    taken: datetime | None = None
+    # Modification time of the source when it was scanned; 0 if unknown.
+    mtime_ns: int = 0
+
+
+class FileStore:
+    """Append-only table of scanned files, one array per field.
+
+    A million FileInfo objects cost gigabytes once their Path objects are
+    counted; here a file costs its name string plus a few bytes per column.
+    Directories are interned, dates are kept as ordinals, capture times as
+    seconds (see to_seconds) and the file type as a byte. Rows are
+    addressed by number and only turned into FileInfo when a caller asks
+    for one. Several threads may add rows at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dirs: list[str] = []
+        self._dir_ids: dict[str, int] = {}
+        self.dir_ids = array("I")
+        self.names: list[str] = []
+        self.ordinals = array("I")
+        self.times = array("q")
+        self.types = bytearray()
+        self.sizes = array("Q")
+        self.mtimes = array("q")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(
+        self,
+        directory: str,
+        name: str,
+        d: date,
+        file_type: str,
+        size: int,
+        mtime_ns: int = 0,
+    ) -> int:
+        """Append a file and return its row number.
+
+        d is the capture datetime, or a plain date when the time is unknown.
+        """
+        ordinal = d.toordinal()
+        seconds = to_seconds(d)
+        type_code = _TYPE_CODES[file_type]
+        with self._lock:
+            dir_id = self._dir_ids.get(directory)
+            if dir_id is None:
+                dir_id = self._dir_ids[directory] = len(self._dirs)
+                self._dirs.append(directory)
+            self.dir_ids.append(dir_id)
+            self.names.append(name)
+            self.ordinals.append(ordinal)
+            self.times.append(seconds)
+            self.types.append(type_code)
+            self.sizes.append(size)
+            self.mtimes.append(mtime_ns)
+            return len(self.names) - 1
+
+    def add_info(self, info: FileInfo) -> int:
+        path = os.fspath(info.path)
+        return self.add(
+            os.path.dirname(path),
+            info.filename,
+            info.taken or info.date,
+            info.file_type,
+            info.size,
+            info.mtime_ns,
+        )
+
+    def path(self, row: int) -> Path:
+        return Path(self._dirs[self.dir_ids[row]], self.names[row])
+
+    def date(self, row: int) -> date:
+        return date.fromordinal(self.ordinals[row])
+
+    def taken(self, row: int) -> datetime:
+        return from_seconds(self.times[row])
+
+    def file_type(self, row: int) -> str:
+        return _TYPE_NAMES[self.types[row]]
+
+    def info(self, row: int) -> FileInfo:
+        return FileInfo(
+            path=self.path(row),
+            filename=self.names[row],
+            date=self.date(row),
+            file_type=_TYPE_NAMES[self.types[row]],
+            size=self.sizes[row],
+            taken=from_seconds(self.times[row]),
+            mtime_ns=self.mtimes[row],
+        )
+
+
+class FileList(Sequence[FileInfo]):
+    """An ordered selection of rows from a FileStore.
+
+    Reads like a list of FileInfo, built one at a time on access, while
+    counting, sizing, splitting and concatenating work on row numbers only.
+    Rows are only ever appended, which lets counts() pick up where it left
+    off instead of recounting the whole list.
+    """
+
+    __slots__ = ("store", "rows", "_counted")
+
+    def __init__(self, store: FileStore, rows: Iterable[int] = ()):
+        self.store = store
+        self.rows = array("I", rows)
+        # (rows counted so far, videos among them)
+        self._counted = (0, 0)
+
+    @classmethod
+    def join(cls, parts: Iterable["FileList"], store: FileStore | None = None) -> "FileList":
+        """Concatenate parts, which must share a store unless one is given."""
+        parts = list(parts)
+        if store is None:
+            store = parts[0].store if parts else FileStore()
+        joined = cls(store)
+        for part in parts:
+            joined.extend(part)
+        return joined
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FileList(self.store, self.rows[index])
+        return self.store.info(self.rows[index])
+
+    def __iter__(self) -> Iterator[FileInfo]:
+        info = self.store.info
+        for row in self.rows:
+            yield info(row)
+
+    def __repr__(self) -> str:
+        return f"<FileList of {len(self.rows)} files>"
+
+    def append(self, info: FileInfo) -> None:
+        self.rows.append(self.store.add_info(info))
+
+    def extend(self, files: Iterable[FileInfo]) -> None:
+        """Append files; rows of the same store are shared, not copied."""
+        if isinstance(files, FileList) and files.store is self.store:
+            self.rows.extend(files.rows)
+        else:
+            for info in files:
+                self.append(info)
+
+    def counts(self) -> tuple[int, int]:
+        """Return (photos, videos)."""
+        counted, videos = self._counted
+        if counted != len(self.rows):
+            videos += sum(map(self.store.types.__getitem__, self.rows[counted:]))
+            counted = len(self.rows)
+            self._counted = (counted, videos)
+        return counted - videos, videos
+
+    def total_size(self) -> int:
+        return sum(map(self.store.sizes.__getitem__, self.rows))
+
+    def split_by_date(self) -> dict[date, "FileList"]:
+        """Split into one FileList per date, keeping the order within each."""
+        by_ordinal: dict[int, array] = {}
+        ordinals = self.store.ordinals
+        for row in self.rows:
+            rows = by_ordinal.get(ordinals[row])
+            if rows is None:
+                rows = by_ordinal[ordinals[row]] = array("I")
+            rows.append(row)
+        result = {}
+        for ordinal, rows in by_ordinal.items():
+            part = FileList(self.store)
+            part.rows = rows
+            result[date.fromordinal(ordinal)] = part
+        return result
+
+
+class FileChain(Sequence[FileInfo]):
+    """Several FileLists read as one, without copying their rows.
+
+    Parts are held by reference, so files appended to a part later show up
+    here too. Length and counts cost one step per part, not per file.
+    """
+
+    __slots__ = ("parts",)
+
+    def __init__(self, parts: Iterable[FileList] = ()):
+        self.parts = list(parts)
+
+    def __len__(self) -> int:
+        return sum(len(part) for part in self.parts)
+
+    def __getitem__(self, index: int) -> FileInfo:
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            for part in self.parts:
+                if index < len(part):
+                    return part[index]
+                index -= len(part)
+        raise IndexError("FileChain index out of range")
+
+    def __iter__(self) -> Iterator[FileInfo]:
+        for part in self.parts:
+            yield from part
+
+    def __repr__(self) -> str:
+        return f"<FileChain of {len(self)} files in {len(self.parts)} parts>"
+
+    def counts(self) -> tuple[int, int]:
+        """Return (photos, videos)."""
+        photos = videos = 0
+        for part in self.parts:
+            p, v = part.counts()
+            photos += p
+            videos += v
+        return photos, videos
+
+    def total_size(self) -> int:
+        return sum(part.total_size() for part in self.parts)
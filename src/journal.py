@@ -0,0 +1,125 @@
+"""Append-only transfer journal, so an interrupted transfer can resume."""
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+JOURNAL_NAME = ".sortit_journal.jsonl"
+
+# Completion records are fsync'ed in batches; a lost record only means the
+# file is re-verified on resume, never re-copied blindly.
+SYNC_EVERY = 64
+
+
+@dataclass
+class JournalState:
+    """What a previous run planned and finished, keyed by journal_key."""
+
+    plans: dict[tuple[str, int, int], Path] = field(default_factory=dict)
+    started: set[tuple[str, int, int]] = field(default_factory=set)
+    done: set[tuple[str, int, int]] = field(default_factory=set)
+
+
+def journal_key(path: str | Path, size: int, mtime_ns: int) -> tuple[str, int, int]:
+    """Identify a source file across runs.
+
+    Path and size alone are not enough: another card mounted at the same
+    place reuses the same DCF names, and RAW files often share one size.
+    """
+    return (str(path), size, mtime_ns)
+
+
+class TransferJournal:
+    """JSON-lines journal of planned source → destination mappings.
+
+    Each line is one record: "plan" (source, size, mtime, destination),
+    "start" or "done". Records are only appended, so a crash can at worst leave a
+    truncated last line, which load() ignores.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+
+    def load(self) -> JournalState:
+        """Read the records left by a previous, unfinished run."""
+        state = JournalState()
+        try:
+            f = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return state
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    key = journal_key(record["src"], record["size"], record["mtime"])
+                    op = record["op"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if op == "plan":
+                    state.plans[key] = Path(record["dest"])
+                elif op == "start":
+                    state.started.add(key)
+                elif op == "done":
+                    state.done.add(key)
+        return state
+
+    def _append(self, records: list[dict], sync: bool) -> None:
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write("".join(json.dumps(r) + "\n" for r in records))
+            self._file.flush()
+            self._unsynced += len(records)
+            if sync or self._unsynced >= SYNC_EVERY:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    def record_plan(
+        self, mappings: list[tuple[str | Path, int, int, str | Path]]
+    ) -> None:
+        """Record (source, size, mtime_ns, destination) for files about to be transferred."""
+        if mappings:
+            self._append(
+                [
+                    {
+                        "op": "plan",
+                        "src": str(src),
+                        "size": size,
+                        "mtime": mtime_ns,
+                        "dest": str(dest),
+                    }
+                    for src, size, mtime_ns, dest in mappings
+                ],
+                sync=True,
+            )
+
+    def record_start(self, src: str | Path, size: int, mtime_ns: int) -> None:
+        self._append(
+            [{"op": "start", "src": str(src), "size": size, "mtime": mtime_ns}],
+            sync=False,
+        )
+
+    def record_done(self, src: str | Path, size: int, mtime_ns: int) -> None:
+        self._append(
+            [{"op": "done", "src": str(src), "size": size, "mtime": mtime_ns}],
+            sync=False,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+    def remove(self) -> None:
+        """Close and delete the journal once the transfer has fully succeeded."""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,408 @@
+"""Bounded-read capture date parsers for common photo and video containers.
+
+These parsers read a small head of the file and jump straight to the tags
+they need, instead of decoding whole EXIF blocks or media data. They raise
+MetadataError when the container is not understood, so callers can fall
+back to exifread or the file's mtime.
+"""
+
+import os
+import struct
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO
+
+# Bytes read up front. DateTimeOriginal sits within the first few KB of
+# JPEGs and TIFF-based RAWs; anything further away is fetched with a small
+# targeted read.
+HEAD_SIZE = 64 * 1024
+
+EXIF_DATE_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+_TAG_EXIF_IFD = 0x8769
+_TAG_DATETIME_ORIGINAL = 0x9003
+_TAG_COMPRESSION = 0x0103
+_TAG_STRIP_OFFSETS = 0x0111
+_TAG_STRIP_BYTE_COUNTS = 0x0117
+_TAG_SUB_IFDS = 0x014A
+_TAG_JPEG_OFFSET = 0x0201
+_TAG_JPEG_LENGTH = 0x0202
+_TYPE_ASCII = 2
+_TYPE_SHORT = 3
+_TYPE_LONG = 4
+_TYPE_IFD = 13
+
+# TIFF compression values for JPEG-encoded image data.
+_JPEG_COMPRESSIONS = {6, 7}
+# Embedded JPEGs smaller than this are placeholders, not usable previews.
+_MIN_PREVIEW_BYTES = 1024
+
+# TIFF magic numbers: standard TIFF/NEF/CR2/ARW/DNG, Panasonic RW2, Olympus ORF.
+_TIFF_MAGICS = {42, 0x55, 0x4F52, 0x5352}
+
+# Guards against corrupt files sending the IFD walk into a loop.
+_MAX_IFD_ENTRIES = 1024
+_MAX_IFDS = 8
+
+_JPEG_SOI = b"\xff\xd8"
+_JPEG_APP1 = 0xE1
+_JPEG_SOS = 0xDA
+_JPEG_EOI = 0xD9
+_EXIF_HEADER = b"Exif\x00\x00"
+
+# ISO-BMFF (MP4/MOV) timestamps count seconds from 1904-01-01 UTC.
+_MAC_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+# Top-level atoms expected at the start of an MP4/MOV file.
+_BMFF_LEADING_ATOMS = {b"ftyp", b"wide", b"free", b"skip", b"mdat", b"moov", b"pnot"}
+# Metadata atoms are small; anything larger is corrupt or not what we want.
+_MAX_META_ATOM = 1 << 20
+_QT_CREATION_DATE_KEY = b"com.apple.quicktime.creationdate"
+
+
+class MetadataError(Exception):
+    """The file's container could not be parsed."""
+
+
+class _Reader:
+    """Random access over a file, served from an in-memory head when possible."""
+
+    def __init__(self, f: BinaryIO, head_size: int = HEAD_SIZE):
+        self.f = f
+        self.head = f.read(head_size)
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        end = offset + size
+        if end <= len(self.head):
+            data = self.head[offset:end]
+        else:
+            self.f.seek(offset)
+            data = self.f.read(size)
+        if len(data) != size:
+            raise MetadataError(f"Truncated read at offset {offset}")
+        return data
+
+
+def _parse_exif_datetime(raw: bytes) -> datetime | None:
+    text = raw.split(b"\x00", 1)[0].decode("ascii", "replace").strip()
+    try:
+        return datetime.strptime(text, EXIF_DATE_FORMAT)
+    except ValueError:
+        return None
+
+
+class _Tiff:
+    """Minimal TIFF structure walker rooted at a byte offset in the file."""
+
+    def __init__(self, reader: _Reader, base: int = 0):
+        self.reader = reader
+        self.base = base
+        header = reader.read_at(base, 8)
+        if header[:2] == b"II":
+            self.endian = "<"
+        elif header[:2] == b"MM":
+            self.endian = ">"
+        else:
+            raise MetadataError("Not a TIFF header")
+        magic, self.first_ifd = struct.unpack(self.endian + "HI", header[2:])
+        if magic not in _TIFF_MAGICS:
+            raise MetadataError(f"Unknown TIFF magic {magic:#x}")
+
+    def entries(self, ifd_offset: int) -> tuple[dict[int, tuple[int, int, bytes]], int]:
+        """Return ({tag: (type, count, value_field)}, next_ifd_offset) for one IFD."""
+        (n,) = struct.unpack(
+            self.endian + "H", self.reader.read_at(self.base + ifd_offset, 2)
+        )
+        if n > _MAX_IFD_ENTRIES:
+            raise MetadataError(f"Implausible IFD with {n} entries")
+        block = self.reader.read_at(self.base + ifd_offset + 2, n * 12 + 4)
+        result = {}
+        for i in range(n):
+            tag, typ, count = struct.unpack_from(self.endian + "HHI", block, i * 12)
+            result[tag] = (typ, count, block[i * 12 + 8:i * 12 + 12])
+        (next_ifd,) = struct.unpack_from(self.endian + "I", block, n * 12)
+        return result, next_ifd
+
+    def long(self, value: bytes) -> int:
+        return struct.unpack(self.endian + "I", value)[0]
+
+    def ints(self, typ: int, count: int, value: bytes) -> list[int]:
+        """Decode a SHORT, LONG or IFD array, following the offset if needed."""
+        if typ == _TYPE_SHORT:
+            fmt, width = "H", 2
+        elif typ in (_TYPE_LONG, _TYPE_IFD):
+            fmt, width = "I", 4
+        else:
+            raise MetadataError(f"Unexpected TIFF type {typ}")
+        if count * width > 4:
+            if count > _MAX_IFD_ENTRIES:
+                raise MetadataError(f"Implausible array of {count} values")
+            value = self.reader.read_at(self.base + self.long(value), count * width)
+        return list(struct.unpack_from(f"{self.endian}{count}{fmt}", value))
+
+    def _entry_int(self, entries: dict, tag: int) -> int | None:
+        entry = entries.get(tag)
+        if entry is None or entry[1] < 1:
+            return None
+        return self.ints(entry[0], entry[1], entry[2])[0]
+
+    def jpeg_previews(self) -> list[tuple[int, int]]:
+        """Return (file offset, length) of JPEGs embedded in the IFDs and SubIFDs."""
+        previews = []
+        pending = [self.first_ifd]
+        seen = set()
+        while pending and len(seen) < _MAX_IFDS * 4:
+            offset = pending.pop()
+            if not offset or offset in seen:
+                continue
+            seen.add(offset)
+            entries, next_ifd = self.entries(offset)
+            pending.append(next_ifd)
+            sub = entries.get(_TAG_SUB_IFDS)
+            if sub is not None:
+                pending.extend(self.ints(*sub))
+
+            start = self._entry_int(entries, _TAG_JPEG_OFFSET)
+            length = self._entry_int(entries, _TAG_JPEG_LENGTH)
+            if start is None and self._entry_int(entries, _TAG_COMPRESSION) in _JPEG_COMPRESSIONS:
+                strips = entries.get(_TAG_STRIP_OFFSETS)
+                counts = entries.get(_TAG_STRIP_BYTE_COUNTS)
+                if strips and counts and strips[1] == 1:
+                    start = self._entry_int(entries, _TAG_STRIP_OFFSETS)
+                    length = self._entry_int(entries, _TAG_STRIP_BYTE_COUNTS)
+            if start is not None and length and length >= _MIN_PREVIEW_BYTES:
+                previews.append((self.base + start, length))
+        return previews
+
+    def ascii(self, count: int, value: bytes) -> bytes:
+        if count <= 4:
+            return value[:count]
+        return self.reader.read_at(self.base + self.long(value), count)
+
+    def exif_ifd_offset(self) -> int | None:
+        """Find the EXIF sub-IFD pointer, following the IFD chain if needed."""
+        offset = self.first_ifd
+        seen = set()
+        while offset and offset not in seen and len(seen) < _MAX_IFDS:
+            seen.add(offset)
+            entries, offset = self.entries(offset)
+            entry = entries.get(_TAG_EXIF_IFD)
+            if entry and entry[0] in (_TYPE_LONG, _TYPE_IFD):
+                return self.long(entry[2])
+        return None
+
+    def datetime_original(self) -> datetime | None:
+        exif_offset = self.exif_ifd_offset()
+        if exif_offset is None:
+            return None
+        entries, _next = self.entries(exif_offset)
+        entry = entries.get(_TAG_DATETIME_ORIGINAL)
+        if entry is None or entry[0] != _TYPE_ASCII:
+            return None
+        return _parse_exif_datetime(self.ascii(entry[1], entry[2]))
+
+
+def _jpeg_exif_base(reader: _Reader) -> int | None:
+    """Return the file offset of the TIFF header inside the Exif APP1 segment."""
+    pos = 2
+    while True:
+        marker = reader.read_at(pos, 4)
+        if marker[0] != 0xFF:
+            raise MetadataError(f"Bad JPEG marker at offset {pos}")
+        kind = marker[1]
+        if kind == 0xFF:
+            # Fill byte before a marker.
+            pos += 1
+            continue
+        if kind in (_JPEG_SOS, _JPEG_EOI):
+            return None
+        (length,) = struct.unpack(">H", marker[2:])
+        if kind == _JPEG_APP1 and reader.read_at(pos + 4, 6) == _EXIF_HEADER:
+            return pos + 4 + len(_EXIF_HEADER)
+        pos += 2 + length
+
+
+def read_embedded_preview(filepath: str | Path) -> bytes | None:
+    """Return the smallest usable JPEG preview embedded in a photo file.
+
+    Covers the EXIF thumbnail of JPEGs and the preview images that
+    TIFF-based RAW formats carry in their IFDs and SubIFDs, so a thumbnail
+    can be made without decoding the full image.
+    """
+    try:
+        with open(filepath, "rb") as f:
+            reader = _Reader(f)
+            if reader.head[:2] == _JPEG_SOI:
+                base = _jpeg_exif_base(reader)
+                if base is None:
+                    return None
+                tiff = _Tiff(reader, base)
+            elif reader.head[:2] in (b"II", b"MM"):
+                tiff = _Tiff(reader)
+            else:
+                return None
+            for start, length in sorted(tiff.jpeg_previews(), key=lambda p: p[1]):
+                data = reader.read_at(start, length)
+                if data[:2] == _JPEG_SOI:
+                    return data
+    except (MetadataError, OSError, struct.error, IndexError):
+        pass
+    return None
+
+
+def read_exif_datetime(filepath: str | Path) -> datetime | None:
+    """Return DateTimeOriginal from a JPEG or TIFF-based RAW file.
+
+    Returns None when the file is understood but carries no usable date.
+
+    Raises:
+        MetadataError: The container is not a JPEG or TIFF, or is malformed.
+        OSError: The file cannot be read.
+    """
+    with open(filepath, "rb") as f:
+        reader = _Reader(f)
+        try:
+            if reader.head[:2] == _JPEG_SOI:
+                base = _jpeg_exif_base(reader)
+                return None if base is None else _Tiff(reader, base).datetime_original()
+            if reader.head[:2] in (b"II", b"MM"):
+                return _Tiff(reader).datetime_original()
+        except (struct.error, IndexError) as e:
+            raise MetadataError(str(e)) from e
+    raise MetadataError("Unsupported container")
+
+
+def _iter_atoms(f: BinaryIO, start: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+    """Yield (type, payload_offset, atom_end) for the atoms between start and end.
+
+    Only the 8 or 16 byte headers are read; payloads are skipped with a seek.
+    """
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, kind = struct.unpack(">I4s", header)
+        header_len = 8
+        if size == 1:
+            large = f.read(8)
+            if len(large) < 8:
+                raise MetadataError(f"Truncated atom header at offset {pos}")
+            (size,) = struct.unpack(">Q", large)
+            header_len = 16
+        elif size == 0:
+            size = end - pos
+        if size < header_len or pos + size > end:
+            raise MetadataError(f"Bad atom size {size} at offset {pos}")
+        yield kind, pos + header_len, pos + size
+        pos += size
+
+
+def _read_payload(f: BinaryIO, offset: int, end: int) -> bytes:
+    if end - offset > _MAX_META_ATOM:
+        raise MetadataError(f"Oversized metadata atom at offset {offset}")
+    f.seek(offset)
+    return f.read(end - offset)
+
+
+def _mvhd_datetime(payload: bytes) -> datetime | None:
+    """Creation time from a movie header, converted from UTC to local time."""
+    version = payload[0]
+    if version == 1:
+        (seconds,) = struct.unpack_from(">Q", payload, 4)
+    else:
+        (seconds,) = struct.unpack_from(">I", payload, 4)
+    if seconds == 0:
+        return None
+    try:
+        utc = _MAC_EPOCH + timedelta(seconds=seconds)
+        return utc.astimezone().replace(tzinfo=None)
+    except (OverflowError, ValueError) as e:
+        raise MetadataError(f"Implausible mvhd creation time {seconds}") from e
+
+
+def _parse_iso_datetime(text: str) -> datetime | None:
+    """Parse a QuickTime creation date, keeping the wall-clock time of capture."""
+    for fmt in ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S"):
+        try:
+            return datetime.strptime(text, fmt).replace(tzinfo=None)
+        except ValueError:
+            continue
+    return None
+
+
+def _quicktime_creation_date(f: BinaryIO, start: int, end: int) -> datetime | None:
+    """Look up com.apple.quicktime.creationdate in a meta atom's keys/ilst."""
+    # QuickTime meta atoms have no version/flags field; ISO ones do.
+    f.seek(start + 4)
+    if f.read(4) != b"hdlr":
+        start += 4
+
+    key_index = None
+    ilst = None
+    for kind, offset, atom_end in _iter_atoms(f, start, end):
+        if kind == b"keys":
+            payload = _read_payload(f, offset, atom_end)
+            (count,) = struct.unpack_from(">I", payload, 4)
+            pos = 8
+            for index in range(1, count + 1):
+                (size,) = struct.unpack_from(">I", payload, pos)
+                if size < 8:
+                    raise MetadataError("Bad QuickTime key entry")
+                if payload[pos + 8:pos + size] == _QT_CREATION_DATE_KEY:
+                    key_index = index
+                    break
+                pos += size
+        elif kind == b"ilst":
+            ilst = (offset, atom_end)
+
+    if key_index is None or ilst is None:
+        return None
+    for kind, offset, atom_end in _iter_atoms(f, *ilst):
+        if struct.unpack(">I", kind)[0] != key_index:
+            continue
+        for data_kind, data_offset, data_end in _iter_atoms(f, offset, atom_end):
+            if data_kind == b"data":
+                # Skip the 4-byte type indicator and 4-byte locale.
+                value = _read_payload(f, data_offset + 8, data_end)
+                return _parse_iso_datetime(value.decode("utf-8", "replace").strip())
+    return None
+
+
+def read_video_datetime(filepath: str | Path) -> datetime | None:
+    """Return the capture time of an MP4/MOV file from its moov atom.
+
+    Prefers the QuickTime creationdate key, which carries the local time of
+    capture, over the UTC creation time in moov/mvhd. Only atom headers and
+    the small metadata atoms are read, wherever moov sits in the file.
+
+    Raises:
+        MetadataError: The file is not an ISO-BMFF container, or is malformed.
+        OSError: The file cannot be read.
+    """
+    with open(filepath, "rb") as f:
+        file_end = os.fstat(f.fileno()).st_size
+        try:
+            atoms = _iter_atoms(f, 0, file_end)
+            first = next(atoms, None)
+            if first is None or first[0] not in _BMFF_LEADING_ATOMS:
+                raise MetadataError("Not an ISO-BMFF container")
+
+            moov = first if first[0] == b"moov" else None
+            if moov is None:
+                moov = next((atom for atom in atoms if atom[0] == b"moov"), None)
+            if moov is None:
+                raise MetadataError("No moov atom")
+
+            mvhd_time = None
+            for kind, offset, atom_end in _iter_atoms(f, moov[1], moov[2]):
+                if kind == b"mvhd":
+                    mvhd_time = _mvhd_datetime(_read_payload(f, offset, atom_end))
+                elif kind == b"meta":
+                    creation = _quicktime_creation_date(f, offset, atom_end)
+                    if creation is not None:
+                        return creation
+            return mvhd_time
+        except (struct.error, IndexError) as e:
+            raise MetadataError(str(e)) from e
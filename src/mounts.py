@@ -0,0 +1,175 @@
+"""Detect removable volumes as they are mounted (Linux)."""
+
+import os
+import re
+import select
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+MOUNTINFO = "/proc/self/mountinfo"
+SYS_ROOT = "/sys"
+
+# Seconds between re-reads when the mount table cannot be polled, and the
+# upper bound between re-reads when it can.
+POLL_INTERVAL = 2.0
+
+_OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+@dataclass(frozen=True)
+class MountPoint:
+    path: str
+    device: str  # "major:minor"
+    fstype: str
+
+    @property
+    def label(self) -> str:
+        # Desktop automounters name the mount point after the volume label.
+        return os.path.basename(self.path.rstrip("/")) or self.path
+
+
+def _unescape(field: str) -> str:
+    """Decode the octal escapes mountinfo uses for spaces and the like."""
+    return _OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), field)
+
+
+def parse_mountinfo(text: str) -> list[MountPoint]:
+    """Parse /proc/<pid>/mountinfo, skipping bind mounts of subdirectories.
+
+    Each line reads: id parent major:minor root mount-point options
+    [optional fields...] - fstype source super-options.
+    """
+    mounts = []
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            separator = fields.index("-", 6)
+        except ValueError:
+            continue
+        if len(fields) < separator + 2 or fields[3] != "/":
+            continue
+        mounts.append(
+            MountPoint(
+                path=_unescape(fields[4]),
+                device=fields[2],
+                fstype=fields[separator + 1],
+            )
+        )
+    return mounts
+
+
+def _read_attr(path: str) -> str:
+    try:
+        with open(path, encoding="ascii", errors="replace") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def is_removable(device: str, sys_root: str = SYS_ROOT) -> bool:
+    """Whether the block device major:minor sits on removable media.
+
+    Partitions are resolved to their disk through /sys/dev/block. The disk
+    counts as removable if its "removable" flag is set, which covers USB
+    sticks and card readers, or if it is an SD card in a built-in slot,
+    which the kernel reports as fixed.
+    """
+    node = os.path.realpath(os.path.join(sys_root, "dev", "block", device))
+    if not os.path.isdir(node):
+        return False
+    if os.path.exists(os.path.join(node, "partition")):
+        node = os.path.dirname(node)
+    disk = os.path.join(sys_root, "block", os.path.basename(node))
+    if _read_attr(os.path.join(disk, "removable")) == "1":
+        return True
+    return _read_attr(os.path.join(disk, "device", "type")) == "SD"
+
+
+def removable_mounts(text: str, sys_root: str = SYS_ROOT) -> list[MountPoint]:
+    """Mounted filesystems of mountinfo text that live on removable disks."""
+    seen = set()
+    result = []
+    for mount in parse_mountinfo(text):
+        # A device mounted twice is listed once, under its first mount point.
+        if mount.device in seen or not is_removable(mount.device, sys_root):
+            continue
+        seen.add(mount.device)
+        result.append(mount)
+    return result
+
+
+def list_removable_mounts(
+    mountinfo: str = MOUNTINFO, sys_root: str = SYS_ROOT
+) -> list[MountPoint]:
+    try:
+        with open(mountinfo, encoding="utf-8", errors="surrogateescape") as f:
+            text = f.read()
+    except OSError:
+        return []
+    return removable_mounts(text, sys_root)
+
+
+class MountWatcher:
+    """Report removable volumes as they are mounted and unmounted.
+
+    A daemon thread polls the mount table, which the kernel flags with
+    POLLPRI on every mount or unmount, and falls back to re-reading it
+    every interval seconds where that is not available. on_change is
+    called from that thread with (added, removed) lists. Volumes already
+    mounted when the watcher starts are not reported as added; see
+    list_removable_mounts for those.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[list[MountPoint], list[MountPoint]], None],
+        interval: float = POLL_INTERVAL,
+        mountinfo: str = MOUNTINFO,
+        sys_root: str = SYS_ROOT,
+    ):
+        self.on_change = on_change
+        self.interval = interval
+        self.mountinfo = mountinfo
+        self.sys_root = sys_root
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        try:
+            f = open(self.mountinfo, "rb")
+        except OSError:
+            return
+        with f:
+            poller = None
+            if hasattr(select, "poll"):
+                poller = select.poll()
+                poller.register(f, select.POLLPRI | select.POLLERR)
+            known: dict[str, MountPoint] | None = None
+            while not self._stop.is_set():
+                # Reading through the polled descriptor is what re-arms it.
+                f.seek(0)
+                text = f.read().decode("utf-8", "surrogateescape")
+                current = {m.device: m for m in removable_mounts(text, self.sys_root)}
+                if known is None:
+                    known = current
+                added = [m for key, m in current.items() if known.get(key) != m]
+                removed = [m for key, m in known.items() if current.get(key) != m]
+                known = current
+                if added or removed:
+                    try:
+                        self.on_change(added, removed)
+                    except Exception:
+                        pass
+                if poller is not None:
+                    poller.poll(self.interval * 1000)
+                else:
+                    self._stop.wait(self.interval)
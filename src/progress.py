@@ -0,0 +1,120 @@
+"""Byte-based transfer progress with rate-limited listener updates."""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+
+# Minimum seconds between two updates sent to the listener.
+DEFAULT_INTERVAL = 0.1
+# Throughput is measured over this many trailing seconds.
+RATE_WINDOW = 5.0
+
+
+@dataclass(frozen=True)
+class ProgressSnapshot:
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+    filename: str
+    rate: float | None  # bytes per second actually transferred
+    eta: float | None  # seconds left at the current rate
+    finished: bool = False
+
+    @property
+    def fraction(self) -> float:
+        if self.bytes_total > 0:
+            return self.bytes_done / self.bytes_total
+        if self.files_total > 0:
+            return self.files_done / self.files_total
+        return 1.0
+
+
+class TransferProgress:
+    """Collects copied bytes and per-file completions, reported at a bounded rate.
+
+    add_bytes() and file_done() may be called from any worker thread:
+    add_bytes() as a copy goes, so a multi-gigabyte video moves the bar
+    too, and file_done() once per file. The listener gets at most one
+    snapshot per interval, on whichever thread crossed it, plus a final
+    one from finish(). Files completed by an earlier run count towards the
+    totals but not towards the throughput.
+    """
+
+    def __init__(
+        self,
+        listener: Callable[[ProgressSnapshot], None],
+        interval: float = DEFAULT_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.listener = listener
+        self.interval = interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._files_total = 0
+        self._bytes_total = 0
+        self._files_done = 0
+        self._bytes_done = 0
+        self._bytes_moved = 0
+        self._last_emit = float("-inf")
+        self._samples: deque[tuple[float, int]] = deque()
+
+    def start(self, files_total: int, bytes_total: int) -> None:
+        with self._lock:
+            self._files_total = files_total
+            self._bytes_total = bytes_total
+            self._samples.clear()
+            self._samples.append((self._clock(), 0))
+
+    def add_bytes(self, n: int, filename: str) -> None:
+        """Count n more bytes copied of a file still in progress."""
+        with self._lock:
+            self._bytes_done += n
+            self._bytes_moved += n
+            self._emit(filename)
+
+    def file_done(
+        self, size: int, filename: str, transferred: bool = True, streamed: int = 0
+    ) -> None:
+        """Count a finished file. streamed is how much of it add_bytes() already counted."""
+        with self._lock:
+            self._files_done += 1
+            self._bytes_done += size - streamed
+            if transferred:
+                self._bytes_moved += size - streamed
+            self._emit(filename)
+
+    def _emit(self, filename: str) -> None:
+        now = self._clock()
+        if now - self._last_emit < self.interval:
+            return
+        self._last_emit = now
+        snapshot = self._snapshot(now, filename)
+        # Called under the lock so snapshots reach the listener in order.
+        self.listener(snapshot)
+
+    def finish(self) -> None:
+        with self._lock:
+            snapshot = self._snapshot(self._clock(), "")
+            self.listener(replace(snapshot, eta=0.0, finished=True))
+
+    def _snapshot(self, now: float, filename: str) -> ProgressSnapshot:
+        self._samples.append((now, self._bytes_moved))
+        while len(self._samples) > 2 and now - self._samples[0][0] > RATE_WINDOW:
+            self._samples.popleft()
+        start_time, start_bytes = self._samples[0]
+        elapsed = now - start_time
+        rate = (self._bytes_moved - start_bytes) / elapsed if elapsed > 0 else None
+        remaining = self._bytes_total - self._bytes_done
+        eta = remaining / rate if rate else None
+        return ProgressSnapshot(
+            files_done=self._files_done,
+            files_total=self._files_total,
+            bytes_done=self._bytes_done,
+            bytes_total=self._bytes_total,
+            filename=filename,
+            rate=rate,
+            eta=eta,
+        )
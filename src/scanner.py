@@ -1,35 +1,79 @@
 """Scan a directory for photos/videos and extract dates."""
 
 import os
+import queue
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import exifread
+from src.filestore import FileChain, FileInfo, FileList, FileStore
+from src.metadata import MetadataError, read_exif_datetime, read_video_datetime
+
+if TYPE_CHECKING:
+    from src.cache import ScanCache
 
 PHOTO_EXTENSIONS = {".nef", ".raw", ".jpg", ".jpeg", ".cr2", ".arw", ".dng"}
 VIDEO_EXTENSIONS = {".mov", ".mp4", ".avi", ".mkv", ".mts"}
 ALL_EXTENSIONS = PHOTO_EXTENSIONS | VIDEO_EXTENSIONS
+# Video formats built on ISO-BMFF atoms, whose capture date lives in moov.
+BMFF_EXTENSIONS = {".mov", ".mp4"}
+# Cameras shooting RAW+JPEG write both under one name. The JPEG's EXIF is
+# found in the first few kilobytes, so it is parsed for the whole pair.
+PAIR_LEADER_EXTENSIONS = {".jpg", ".jpeg"}
 
+# Default pool size for metadata extraction. Reads are I/O-bound, so this is
+# deliberately larger than the CPU count.
+DEFAULT_SCAN_WORKERS = 8
+
+# Files per batch yielded by iter_scan. Small enough that the first dates
+# show up quickly, large enough to keep UI updates infrequent.
+DEFAULT_BATCH_SIZE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class SourceEntry:
+    """A supported file found during enumeration, with its stat already taken."""
 
-@dataclass
-class FileInfo:
     path: Path
     filename: str
-    date: date
     file_type: str  # "photo" or "video"
     size: int
+    mtime_ns: int
+
+
+@dataclass
+class ScanBatch:
+    files: FileList
+    # Running (photos, videos) totals for every date touched by this batch.
+    counts: dict[date, tuple[int, int]]
 
 
 @dataclass
 class Group:
     name: str
     dates: list[date] = field(default_factory=list)
-    files: list[FileInfo] = field(default_factory=list)
+    files: Sequence[FileInfo] = field(default_factory=list)
+
+    def __post_init__(self):
+        # Kept sorted so the bounds, read once per planned file, are O(1).
+        self.dates = sorted(self.dates)
 
     @property
     def first_date(self) -> date:
-        return min(self.dates)
+        return self.dates[0]
+
+    @property
+    def last_date(self) -> date:
+        return self.dates[-1]
+
+    def counts(self) -> tuple[int, int]:
+        """Return (photos, videos) in the group."""
+        return count_for_date(self.files)
 
 
 def classify_file(ext: str) -> str | None:
@@ -42,83 +86,613 @@ def classify_file(ext: str) -> str | None:
     return None
 
 
+def extract_exif_datetime(filepath: Path) -> datetime | None:
+    """Extract DateTimeOriginal from EXIF data.
+
+    Uses the bounded-read parser in src.metadata and only falls back to
+    exifread for containers it does not understand.
+    """
+    try:
+        return read_exif_datetime(filepath)
+    except MetadataError:
+        return _exifread_datetime(filepath)
+    except Exception:
+        # Unreadable or hostile file: fall back to the mtime, never abort.
+        return None
+
+
 def extract_exif_date(filepath: Path) -> date | None:
+    dt = extract_exif_datetime(filepath)
+    return dt.date() if dt else None
+
+
+def _exifread_date(filepath: Path) -> date | None:
+    dt = _exifread_datetime(filepath)
+    return dt.date() if dt else None
+
+
+def _exifread_datetime(filepath: Path) -> datetime | None:
     """Extract DateTimeOriginal from EXIF data using exifread."""
+    # Imported on first use: the native parser handles nearly every file.
+    import exifread
+
     try:
         with open(filepath, "rb") as f:
             tags = exifread.process_file(f, stop_tag="DateTimeOriginal", details=False)
         tag = tags.get("EXIF DateTimeOriginal")
         if tag:
-            dt = datetime.strptime(str(tag), "%Y:%m:%d %H:%M:%S")
-            return dt.date()
+            return datetime.strptime(str(tag), "%Y:%m:%d %H:%M:%S")
     except Exception:
         pass
     return None
 
 
-def extract_date(filepath: Path) -> date:
-    """Extract date from EXIF or fall back to file modification time."""
-    exif_date = extract_exif_date(filepath)
-    if exif_date:
-        return exif_date
-    mtime = os.path.getmtime(filepath)
-    return datetime.fromtimestamp(mtime).date()
+def extract_video_datetime(filepath: Path) -> datetime | None:
+    """Extract the capture time of an MP4/MOV from its moov atom."""
+    if Path(filepath).suffix.lower() not in BMFF_EXTENSIONS:
+        return None
+    try:
+        return read_video_datetime(filepath)
+    except Exception:
+        return None
+
+
+def extract_video_date(filepath: Path) -> date | None:
+    dt = extract_video_datetime(filepath)
+    return dt.date() if dt else None
 
 
-def scan_directory(path: str | Path) -> dict[date, list[FileInfo]]:
-    """Recursively scan a directory and return files grouped by date.
+def extract_datetime(filepath: Path, mtime_ns: int | None = None) -> datetime:
+    """Extract the capture time from EXIF or video metadata, or fall back to file modification time.
 
-    Args:
-        path: Root directory to scan.
+    Pass mtime_ns when the file has already been stat'ed to avoid another
+    round trip to the disk on the fallback path. Sub-second parts are
+    dropped, matching what EXIF records.
+    """
+    taken = _metadata_datetime(filepath)
+    if taken:
+        return taken
+    if mtime_ns is None:
+        mtime_ns = os.stat(filepath).st_mtime_ns
+    return datetime.fromtimestamp(mtime_ns // 1_000_000_000)
 
-    Returns:
-        Dictionary mapping dates to lists of FileInfo objects.
+
+def _metadata_datetime(filepath: Path) -> datetime | None:
+    if classify_file(Path(filepath).suffix) == "video":
+        return extract_video_datetime(filepath)
+    return extract_exif_datetime(filepath)
+
+
+def extract_date(filepath: Path, mtime_ns: int | None = None) -> date:
+    """Extract date from EXIF or video metadata, or fall back to file modification time."""
+    return extract_datetime(filepath, mtime_ns).date()
+
+
+def _extract_entry_datetime(entry: SourceEntry) -> tuple[datetime | None, bool]:
+    """Capture time of one file, and whether it was read from its metadata.
+
+    The time falls back to the mtime, and is None if the file cannot be
+    read. Errors are per file: one bad file is left out, it never ends
+    the scan.
     """
-    path = Path(path)
-    result: dict[date, list[FileInfo]] = {}
+    try:
+        taken = _metadata_datetime(entry.path)
+        if taken:
+            return taken, True
+        return datetime.fromtimestamp(entry.mtime_ns // 1_000_000_000), False
+    except Exception:
+        return None, False
+
+
+def _extract_datetimes(entries: list[SourceEntry]) -> list[tuple[datetime | None, bool]]:
+    # Workers only send times back; the caller already has everything else.
+    return [_extract_entry_datetime(entry) for entry in entries]
 
-    for root, _dirs, files in os.walk(path):
-        for filename in files:
-            ext = os.path.splitext(filename)[1].lower()
-            file_type = classify_file(ext)
+
+def _make_executor(workers: int, executor: str) -> Executor:
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    if executor == "process":
+        # Pulls in multiprocessing, so only imported when asked for.
+        from concurrent.futures import ProcessPoolExecutor
+
+        return ProcessPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown executor: {executor!r} (expected 'thread' or 'process')")
+
+
+def iter_source_entries(
+    path: str | Path, dir_stamps: dict[str, int] | None = None
+) -> Iterator[SourceEntry]:
+    """Yield a SourceEntry for every supported file under path.
+
+    Built on os.scandir so each file costs a single stat (none on Windows,
+    where the directory listing already carries it), which matters on exFAT
+    cards behind USB readers. Order matches a top-down os.walk.
+
+    Args:
+        path: Root directory to enumerate.
+        dir_stamps: If given, filled with a stamp per visited directory
+            (see _dir_stamp) so the enumeration can later be checked for
+            staleness without re-stating every file.
+    """
+    stack = [os.fspath(path)]
+    while stack:
+        root = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(root) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        if dir_stamps is not None:
+            dir_stamps[root] = _dir_stamp(entry.name for entry in entries)
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+            except OSError:
+                continue
+            file_type = classify_file(os.path.splitext(entry.name)[1])
             if file_type is None:
                 continue
-
-            filepath = Path(root) / filename
             try:
-                file_date = extract_date(filepath)
-                size = filepath.stat().st_size
+                st = entry.stat()
             except OSError:
                 continue
-
-            info = FileInfo(
-                path=filepath,
-                filename=filename,
-                date=file_date,
+            yield SourceEntry(
+                path=Path(entry.path),
+                filename=entry.name,
                 file_type=file_type,
-                size=size,
+                size=st.st_size,
+                mtime_ns=st.st_mtime_ns,
             )
+        stack.extend(reversed(subdirs))
+
+
+def _dir_stamp(names: Iterable[str]) -> int:
+    """Fingerprint a directory's listing.
+
+    Based on names rather than the directory mtime, which FAT-formatted
+    cards do not reliably update.
+    """
+    return hash(tuple(sorted(names)))
+
+
+class SourceListing:
+    """Enumeration of a source tree, reusable until the tree changes."""
+
+    def __init__(self, root: str, entries: list[SourceEntry], dir_stamps: dict[str, int]):
+        self.root = root
+        self.entries = entries
+        self._dir_stamps = dir_stamps
 
-            result.setdefault(file_date, []).append(info)
+    @classmethod
+    def build(cls, root: str | Path) -> "SourceListing":
+        dir_stamps: dict[str, int] = {}
+        entries = list(iter_source_entries(root, dir_stamps))
+        return cls(os.fspath(root), entries, dir_stamps)
+
+    def is_stale(self) -> bool:
+        """Return True if any directory gained, lost or renamed an entry.
+
+        Costs one directory listing per folder and no per-file stat. Files
+        rewritten in place under the same name are not detected.
+        """
+        for dirpath, stamp in self._dir_stamps.items():
+            try:
+                with os.scandir(dirpath) as it:
+                    if _dir_stamp(entry.name for entry in it) != stamp:
+                        return True
+            except OSError:
+                return True
+        return False
 
+
+def device_of(path: str | Path) -> int | str:
+    """Identify the device holding path, falling back to the path itself."""
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return str(path)
+
+
+def _pair_units(entries: Iterable[SourceEntry]) -> Iterator[list[SourceEntry]]:
+    """Yield entries alone, or a JPEG followed by its RAW siblings.
+
+    Siblings are photos of one folder whose names differ only by extension,
+    compared case-insensitively. Entries come folder by folder, so one
+    folder is held back at a time; within it, a pair is placed where its
+    first member was.
+    """
+    folder = None
+    groups: list[list[SourceEntry]] = []  # the folder's entries, siblings together
+    by_stem: dict[str, list[SourceEntry]] = {}
+    for entry in entries:
+        path = os.fspath(entry.path)
+        parent = path[: len(path) - len(entry.filename)]
+        if parent != folder:
+            yield from _split_siblings(groups)
+            groups = []
+            by_stem = {}
+            folder = parent
+        if entry.file_type != "photo":
+            groups.append([entry])
+            continue
+        # Every scanned file has an extension, the one it was classified by.
+        stem = entry.filename.rpartition(".")[0].lower()
+        siblings = by_stem.get(stem)
+        if siblings is None:
+            siblings = by_stem[stem] = []
+            groups.append(siblings)
+        siblings.append(entry)
+    yield from _split_siblings(groups)
+
+
+def _split_siblings(groups: list[list[SourceEntry]]) -> Iterator[list[SourceEntry]]:
+    """Turn same-stem groups into units: a pair needs a JPEG to lead it."""
+    for siblings in groups:
+        if len(siblings) == 1:
+            yield siblings
+            continue
+        leaders = [
+            e for e in siblings
+            if os.path.splitext(e.filename)[1].lower() in PAIR_LEADER_EXTENSIONS
+        ]
+        if not leaders:
+            for entry in siblings:
+                yield [entry]
+            continue
+        leader = leaders[0]
+        yield [leader, *(e for e in siblings if e is not leader)]
+
+
+def _chunked_units(units: Iterable[list], size: int) -> Iterator[list[list]]:
+    """Group units into chunks of at least size entries, never splitting one."""
+    chunk: list[list] = []
+    count = 0
+    for unit in units:
+        chunk.append(unit)
+        count += len(unit)
+        if count >= size:
+            yield chunk
+            chunk = []
+            count = 0
+    if chunk:
+        yield chunk
+
+
+class _PendingBatch:
+    """One batch in flight: cached results plus the futures still extracting.
+
+    Only the first entry of each unit is looked up and extracted; the RAW
+    files of a RAW+JPEG pair take the JPEG's capture time. When the JPEG
+    has no usable metadata and only its mtime to go by, the RAW files are
+    read after all, as they may still carry the real capture time.
+    """
+
+    def __init__(self, units: list[list[SourceEntry]], cache, pool, workers):
+        self.entries: list[SourceEntry] = []
+        # Index of the entry each entry takes its time from.
+        self.leaders: list[int] = []
+        for unit in units:
+            self.leaders.extend([len(self.entries)] * len(unit))
+            self.entries.extend(unit)
+        entries = self.entries
+        self.times: list[datetime | None] = [None] * len(entries)
+        # Whether each time was read from metadata rather than the mtime.
+        self.exact: list[bool] = [False] * len(entries)
+        self.pending = [i for i, leader in enumerate(self.leaders) if leader == i]
+        if cache is not None:
+            self.pending = self._apply_cache(cache, self.pending)
+
+        todo = [entries[i] for i in self.pending]
+        if pool is None:
+            self.parts = [_extract_datetimes(todo)]
+            return
+        # Split across the pool so a single batch is extracted in parallel.
+        step = max(1, -(-len(todo) // workers))
+        self.parts = [
+            pool.submit(_extract_datetimes, todo[start:start + step])
+            for start in range(0, len(todo), step)
+        ]
+
+    def _apply_cache(self, cache: "ScanCache", indices: list[int]) -> list[int]:
+        """Fill in cached times; return the indices still to extract."""
+        entries = [self.entries[i] for i in indices]
+        hits = cache.lookup([(str(e.path), e.size, e.mtime_ns) for e in entries])
+        misses = []
+        for i, entry in zip(indices, entries):
+            hit = hits.get(str(entry.path))
+            if hit is None:
+                misses.append(i)
+            else:
+                self.times[i], self.exact[i] = hit[0], hit[1]
+        return misses
+
+    def _record(
+        self,
+        indices: list[int],
+        extracted: list[tuple[datetime | None, bool]],
+        cache: "ScanCache | None",
+    ) -> None:
+        new_rows = []
+        for i, (taken, exact) in zip(indices, extracted):
+            self.times[i] = taken
+            self.exact[i] = exact
+            if cache is not None and taken is not None:
+                entry = self.entries[i]
+                new_rows.append(
+                    (
+                        str(entry.path),
+                        entry.size,
+                        entry.mtime_ns,
+                        taken,
+                        exact,
+                        entry.file_type,
+                    )
+                )
+        if cache is not None:
+            cache.store(new_rows)
+
+    def result(self, cache: "ScanCache | None", store: FileStore) -> FileList:
+        extracted: list[tuple[datetime | None, bool]] = []
+        for part in self.parts:
+            extracted.extend(part if isinstance(part, list) else part.result())
+        self._record(self.pending, extracted, cache)
+
+        # RAW files whose JPEG was unreadable or had no metadata.
+        orphans = [
+            i for i, leader in enumerate(self.leaders)
+            if leader != i and not self.exact[leader]
+        ]
+        if orphans:
+            if cache is not None:
+                orphans = self._apply_cache(cache, orphans)
+            todo = [self.entries[i] for i in orphans]
+            self._record(orphans, _extract_datetimes(todo), cache)
+        for i, leader in enumerate(self.leaders):
+            if leader != i and self.exact[leader]:
+                self.times[i] = self.times[leader]
+
+        files = FileList(store)
+        for entry, taken in zip(self.entries, self.times):
+            if taken is not None:
+                path = os.fspath(entry.path)
+                files.rows.append(
+                    store.add(
+                        os.path.dirname(path),
+                        entry.filename,
+                        taken,
+                        entry.file_type,
+                        entry.size,
+                        entry.mtime_ns,
+                    )
+                )
+        return files
+
+
+def iter_scan(
+    path: str | Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int | None = None,
+    executor: str = "thread",
+    cache: "ScanCache | None" = None,
+    entries: Iterable[SourceEntry] | None = None,
+    store: FileStore | None = None,
+) -> Iterator[ScanBatch]:
+    """Recursively scan a directory, yielding file batches as they are ready.
+
+    The walk is lazy and feeds the worker pool batch by batch, so the first
+    results arrive long before the whole tree has been visited. Batches are
+    yielded in walk order, so concatenating them gives the same files as a
+    serial scan whatever the pool size. RAW+JPEG pairs are the exception
+    to strict walk order: each pair is placed together, JPEG first, and
+    only the JPEG is parsed (see _pair_units).
+
+    Args:
+        path: Root directory to scan.
+        batch_size: Number of candidate files per batch.
+        workers: Pool size. Defaults to DEFAULT_SCAN_WORKERS; 1 or less
+            scans serially in the calling thread.
+        executor: "thread" for I/O-bound reads, or "process" to spread
+            EXIF parsing across CPU cores.
+        cache: Optional ScanCache. Files whose size and mtime match a
+            cached entry skip EXIF parsing; new results are stored back.
+        entries: Files to scan, e.g. from an existing SourceListing. When
+            omitted, path is enumerated with iter_source_entries.
+        store: FileStore the batches' files are added to. Defaults to a new
+            one shared by every batch of this scan.
+
+    Yields:
+        ScanBatch objects with the batch's files and running per-date counts.
+    """
+    if workers is None:
+        workers = DEFAULT_SCAN_WORKERS
+    if entries is None:
+        entries = iter_source_entries(path)
+    if store is None:
+        store = FileStore()
+
+    counts: dict[int, list[int]] = {}  # date ordinal -> [photos, videos]
+
+    def finish(batch: _PendingBatch) -> ScanBatch:
+        files = batch.result(cache, store)
+        return ScanBatch(files=files, counts=_count_batch(counts, files))
+
+    pool = _make_executor(workers, executor) if workers > 1 else None
+    try:
+        in_flight: deque[_PendingBatch] = deque()
+        for chunk in _chunked_units(_pair_units(entries), batch_size):
+            in_flight.append(_PendingBatch(chunk, cache, pool, workers))
+            # Keep one batch queued behind the one being extracted so the
+            # pool never idles while the caller consumes results.
+            if len(in_flight) > 1:
+                yield finish(in_flight.popleft())
+        while in_flight:
+            yield finish(in_flight.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _count_batch(counts: dict[int, list[int]], files: FileList) -> dict[date, tuple[int, int]]:
+    """Add files to running per-ordinal totals; return the totals they touched."""
+    store = files.store
+    touched = set()
+    for row in files.rows:
+        ordinal = store.ordinals[row]
+        totals = counts.get(ordinal)
+        if totals is None:
+            totals = counts[ordinal] = [0, 0]
+        totals[store.types[row]] += 1
+        touched.add(ordinal)
+    return {date.fromordinal(o): tuple(counts[o]) for o in touched}
+
+
+def iter_scan_sources(
+    sources: Iterable["str | Path | SourceListing"],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int | None = None,
+    executor: str = "thread",
+    cache: "ScanCache | None" = None,
+    store: FileStore | None = None,
+) -> Iterator[ScanBatch]:
+    """Scan several sources at once, yielding batches as they are ready.
+
+    Sources are grouped by the device they live on. Each device gets a
+    thread running iter_scan over its sources in turn, with its own pool
+    of workers, so cards in separate readers are read in parallel while
+    two folders of one card do not compete for it. Batches of different
+    devices interleave; counts are running totals over every source.
+
+    Args:
+        sources: Paths, or SourceListings whose entries are scanned as is.
+        batch_size, workers, executor, cache: See iter_scan. workers is
+            per device.
+        store: FileStore shared by every source. Defaults to a new one.
+    """
+    if store is None:
+        store = FileStore()
+    by_device: dict[int | str, list] = {}
+    for source in sources:
+        root = source.root if isinstance(source, SourceListing) else source
+        by_device.setdefault(device_of(root), []).append(source)
+
+    results: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    finished = object()
+
+    def scan_device(device_sources: list) -> None:
+        try:
+            for source in device_sources:
+                if isinstance(source, SourceListing):
+                    root, entries = source.root, source.entries
+                else:
+                    root, entries = source, None
+                batches = iter_scan(
+                    root, batch_size, workers, executor, cache, entries, store
+                )
+                try:
+                    for batch in batches:
+                        if stop.is_set():
+                            return
+                        results.put(batch.files)
+                finally:
+                    batches.close()
+        except BaseException as e:
+            results.put(e)
+        finally:
+            results.put(finished)
+
+    threads = [
+        threading.Thread(target=scan_device, args=(device_sources,), daemon=True)
+        for device_sources in by_device.values()
+    ]
+    for thread in threads:
+        thread.start()
+    counts: dict[int, list[int]] = {}
+    try:
+        running = len(threads)
+        while running:
+            item = results.get()
+            if item is finished:
+                running -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield ScanBatch(files=item, counts=_count_batch(counts, item))
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def _merge_by_date(batches: Iterable[ScanBatch]) -> dict[date, FileList]:
+    result: dict[date, FileList] = {}
+    for batch in batches:
+        for d, files in batch.files.split_by_date().items():
+            if d in result:
+                result[d].extend(files)
+            else:
+                result[d] = files
     return result
 
 
-def count_files(files_by_date: dict[date, list[FileInfo]]) -> tuple[int, int]:
+def scan_directory(
+    path: str | Path,
+    workers: int | None = None,
+    executor: str = "thread",
+    cache: "ScanCache | None" = None,
+) -> dict[date, FileList]:
+    """Recursively scan a directory and return files grouped by date.
+
+    Convenience wrapper around iter_scan that waits for the whole tree.
+
+    Args:
+        path: Root directory to scan.
+        workers: Pool size, see iter_scan.
+        executor: "thread" or "process", see iter_scan.
+        cache: Optional ScanCache, see iter_scan.
+
+    Returns:
+        Dictionary mapping dates to FileLists over one shared FileStore.
+    """
+    return _merge_by_date(
+        iter_scan(path, workers=workers, executor=executor, cache=cache)
+    )
+
+
+def scan_sources(
+    paths: Iterable[str | Path],
+    workers: int | None = None,
+    executor: str = "thread",
+    cache: "ScanCache | None" = None,
+) -> dict[date, FileList]:
+    """Scan several directories concurrently and return their files grouped by date.
+
+    Convenience wrapper around iter_scan_sources; see scan_directory.
+    """
+    return _merge_by_date(
+        iter_scan_sources(paths, workers=workers, executor=executor, cache=cache)
+    )
+
+
+def count_files(files_by_date: dict[date, Sequence[FileInfo]]) -> tuple[int, int]:
     """Count total photos and videos across all dates."""
     photos = 0
     videos = 0
     for files in files_by_date.values():
-        for f in files:
-            if f.file_type == "photo":
-                photos += 1
-            else:
-                videos += 1
+        p, v = count_for_date(files)
+        photos += p
+        videos += v
     return photos, videos
 
 
-def count_for_date(files: list[FileInfo]) -> tuple[int, int]:
+def count_for_date(files: Sequence[FileInfo]) -> tuple[int, int]:
     """Count photos and videos for a single date's file list."""
+    if isinstance(files, (FileList, FileChain)):
+        return files.counts()
     photos = sum(1 for f in files if f.file_type == "photo")
     videos = sum(1 for f in files if f.file_type == "video")
     return photos, videos
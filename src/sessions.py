@@ -0,0 +1,94 @@
+"""Propose groups by clustering capture times into shooting sessions."""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import compress, count, islice
+from operator import sub
+
+from src.catalog import Catalog
+from src.filestore import SECONDS_PER_DAY, from_seconds
+
+# Idle time that ends a session when the caller does not choose one.
+DEFAULT_GAP = timedelta(hours=2)
+
+
+@dataclass(frozen=True)
+class Proposal:
+    """Dates whose files form one or more sessions, proposed as a group."""
+
+    dates: list[date]
+    start: datetime
+    end: datetime
+    files: int
+    sessions: int
+
+
+def split_sessions(times: Iterable[int], gap: int) -> list[tuple[int, int, int]]:
+    """Cluster capture times, in seconds, into sessions.
+
+    Times are sorted, and a new session starts wherever two consecutive
+    times are more than gap seconds apart. The pass over the gaps runs in
+    map/compress rather than a Python loop, so 100k files take a few
+    milliseconds on top of the sort.
+
+    Returns:
+        (first, last, file count) per session, in time order.
+    """
+    ordered = sorted(times)
+    if not ordered:
+        return []
+    gaps = map(sub, islice(ordered, 1, None), ordered)
+    breaks = list(compress(count(1), map(gap.__lt__, gaps)))
+    starts = [0, *breaks]
+    ends = [*breaks, len(ordered)]
+    return [(ordered[s], ordered[e - 1], e - s) for s, e in zip(starts, ends)]
+
+
+def propose_groups(
+    catalog: Catalog, gap: timedelta = DEFAULT_GAP, dates: Iterable[date] | None = None
+) -> list[Proposal]:
+    """Propose groups for dates of the catalog, split on idle gaps.
+
+    Groups are made of whole dates, so sessions that share a date are
+    merged: a shoot running past midnight yields one proposal covering
+    both days, and two sessions on the same day cannot be told apart.
+
+    Args:
+        catalog: Scanned files.
+        gap: Idle time that ends a session.
+        dates: Dates to cluster. Defaults to the unassigned ones.
+    """
+    dates = sorted(catalog.unassigned() if dates is None else dates)
+    times = catalog.store.times
+    seconds = []
+    for d in dates:
+        seconds.extend(map(times.__getitem__, catalog.files(d).rows))
+    sessions = split_sessions(seconds, int(gap.total_seconds()))
+
+    # Merge sessions whose day spans overlap; they are in time order.
+    merged: list[list[int]] = []  # [first, last, files, sessions]
+    for first, last, n in sessions:
+        if merged and first // SECONDS_PER_DAY <= merged[-1][1] // SECONDS_PER_DAY:
+            current = merged[-1]
+            current[1] = max(current[1], last)
+            current[2] += n
+            current[3] += 1
+        else:
+            merged.append([first, last, n, 1])
+
+    proposals = []
+    for first, last, n, n_sessions in merged:
+        lo = bisect_left(dates, date.fromordinal(first // SECONDS_PER_DAY))
+        hi = bisect_right(dates, date.fromordinal(last // SECONDS_PER_DAY))
+        proposals.append(
+            Proposal(
+                dates=dates[lo:hi],
+                start=from_seconds(first),
+                end=from_seconds(last),
+                files=n,
+                sessions=n_sessions,
+            )
+        )
+    return proposals
@@ -0,0 +1,205 @@
+"""Background thumbnail generation with a size-bounded disk cache."""
+
+import hashlib
+import io
+import os
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.cache import default_cache_dir
+from src.metadata import read_embedded_preview
+from src.scanner import FileInfo
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+THUMB_SIZE = (64, 64)
+THUMB_WORKERS = 4
+# Photos tried per date before giving up on a thumbnail.
+MAX_CANDIDATES = 3
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+# When the cache is over its limit, evict down to this share of it.
+EVICT_RATIO = 0.8
+
+_DECODABLE_EXTENSIONS = {".jpg", ".jpeg"}
+
+
+def _render(source: "Image.Image") -> "Image.Image":
+    # draft() lets the JPEG decoder scale by 1/2 to 1/8 while decoding,
+    # which is far cheaper than decoding at full size and shrinking.
+    source.draft("RGB", (THUMB_SIZE[0] * 2, THUMB_SIZE[1] * 2))
+    img = source.convert("RGB")
+    img.thumbnail(THUMB_SIZE)
+    return img
+
+
+def make_thumbnail(path: Path) -> "Image.Image | None":
+    """Build a thumbnail, preferring an embedded preview over a full decode."""
+    # PIL is imported on first use so that loading this module stays cheap.
+    from PIL import Image
+
+    preview = read_embedded_preview(path)
+    if preview is not None:
+        try:
+            with Image.open(io.BytesIO(preview)) as source:
+                return _render(source)
+        except Exception:
+            pass
+    if path.suffix.lower() in _DECODABLE_EXTENSIONS:
+        try:
+            with Image.open(path) as source:
+                return _render(source)
+        except Exception:
+            pass
+    return None
+
+
+class ThumbnailDiskCache:
+    """JPEG thumbnails on disk, keyed by path, size and mtime.
+
+    Hits refresh the file's mtime, and eviction removes the least recently
+    used files once the total size exceeds max_bytes.
+    """
+
+    def __init__(
+        self, cache_dir: str | Path | None = None, max_bytes: int = DEFAULT_CACHE_BYTES
+    ):
+        if cache_dir is None:
+            cache_dir = default_cache_dir() / "thumbnails"
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: int | None = None
+
+    def _key_path(self, path: Path) -> Path | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = f"{os.fspath(path)}|{st.st_size}|{st.st_mtime_ns}|{THUMB_SIZE}"
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{name}.jpg"
+
+    def get(self, path: Path) -> "Image.Image | None":
+        from PIL import Image
+
+        cached = self._key_path(path)
+        if cached is None:
+            return None
+        try:
+            with Image.open(cached) as img:
+                img.load()
+            os.utime(cached)
+            return img
+        except (OSError, ValueError):
+            return None
+
+    def put(self, path: Path, img: "Image.Image") -> None:
+        cached = self._key_path(path)
+        if cached is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            img.save(cached, "JPEG", quality=85)
+            size = cached.stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan_total()
+            else:
+                self._total += size
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _scan_total(self) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(self.cache_dir))
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _mtime, size, _path in entries)
+        target = self.max_bytes * EVICT_RATIO
+        for _mtime, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+        self._total = total
+
+    def clear(self) -> None:
+        with self._lock:
+            if self.cache_dir.is_dir():
+                for entry in os.scandir(self.cache_dir):
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+            self._total = 0
+
+
+class ThumbnailService:
+    """Generates thumbnails on a background pool, backed by the disk cache."""
+
+    def __init__(
+        self, cache: ThumbnailDiskCache | None = None, workers: int = THUMB_WORKERS
+    ):
+        self.cache = cache or ThumbnailDiskCache()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumb")
+        self._closed = False
+
+    def _thumbnail_for(self, candidates: list[FileInfo]) -> "Image.Image | None":
+        for f in candidates:
+            img = self.cache.get(f.path)
+            if img is not None:
+                return img
+        for f in candidates:
+            img = make_thumbnail(f.path)
+            if img is not None:
+                self.cache.put(f.path, img)
+                return img
+        return None
+
+    def request(
+        self,
+        files: Iterable[FileInfo],
+        callback: Callable[["Image.Image | None"], None],
+    ) -> Future:
+        """Build a thumbnail for one of files in the background.
+
+        callback runs on a worker thread with the image, or None if no file
+        yielded one; UI code must hop back to its own thread before using it.
+        It is not called once the service has been shut down.
+        """
+        photos = (f for f in files if f.file_type == "photo")
+        future = self._pool.submit(
+            self._thumbnail_for, list(islice(photos, MAX_CANDIDATES))
+        )
+
+        def done(f: Future) -> None:
+            if not self._closed:
+                callback(None if f.cancelled() or f.exception() else f.result())
+
+        future.add_done_callback(done)
+        return future
+
+    def shutdown(self) -> None:
+        """Drop queued requests and silence callbacks, e.g. when the UI goes away.
+
+        Does not wait: the thumbnails being built finish in the background.
+        """
+        self._closed = True
+        self._pool.shutdown(wait=False, cancel_futures=True)
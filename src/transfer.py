@@ -1,36 +1,555 @@
 """Transfer (copy/move) files to organized destination folders."""
 
+import ctypes
+import errno
+import filecmp
+import hashlib
 import os
 import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable
 
-from src.scanner import FileInfo, Group
+from src.dedup import ContentComparer, full_hash
+from src.journal import JOURNAL_NAME, JournalState, TransferJournal, journal_key
+from src.progress import TransferProgress
+from src.scanner import FileInfo, Group, device_of
 
+# Worker threads per queue. Each pair of source and destination devices
+# gets its own queue: photos and videos usually go to different disks, and
+# several cards may be read at once.
+DEFAULT_QUEUE_CONCURRENCY = 2
 
-def _unique_path(dest: Path) -> Path:
-    """Return a unique path by appending _1, _2, etc. if dest already exists."""
-    if not dest.exists():
-        return dest
-    stem = dest.stem
-    suffix = dest.suffix
-    parent = dest.parent
-    counter = 1
-    while True:
-        new_name = f"{stem}_{counter}{suffix}"
-        candidate = parent / new_name
-        if not candidate.exists():
-            return candidate
-        counter += 1
-
-
-def _build_dest_path(base_dir: Path, group: Group, filename: str) -> Path:
-    """Build destination path: base/YYYY/MM/DD_GroupName/filename."""
+# Bytes handed to the kernel per copy_file_range/sendfile call.
+COPY_CHUNK = 64 * 1024 * 1024
+# Chunk size instead when progress is reported as the copy goes: small
+# enough that even a slow card updates the bar several times a second.
+PROGRESS_CHUNK = 8 * 1024 * 1024
+# Files at least this large get their destination preallocated, which keeps
+# big videos in few extents.
+PREALLOCATE_MIN = 8 * 1024 * 1024
+# fallocate(2) mode: allocate blocks without changing the file size.
+FALLOC_FL_KEEP_SIZE = 0x01
+
+# Buffer for the hashing copy used when verifying.
+VERIFY_BUFFER = 4 * 1024 * 1024
+# Checksum file written into every DD_GroupName folder, in the format read
+# by `sha256sum -c`.
+MANIFEST_NAME = "SHA256SUMS"
+
+# Errors meaning "this syscall can't copy between these files", raised
+# before any byte is written. Anything else is a real I/O error.
+_UNSUPPORTED_COPY_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EBADF,
+}
+
+
+@dataclass
+class TransferTask:
+    file_info: FileInfo
+    dest: Path
+    # Destination was planned by an earlier, interrupted run.
+    resumed: bool = False
+    # The earlier run started writing it, so it may be partly there.
+    started: bool = False
+    # The earlier run recorded this file as complete.
+    done: bool = False
+    # Identical content is already at the destination, or queued there by
+    # another source file; nothing to write.
+    duplicate: bool = False
+
+
+@dataclass
+class _NameSeries:
+    """Names tried for one destination: name, name_1, name_2 and so on."""
+
+    # Every name before this suffix number is taken (0 is the bare name).
+    next: int = 0
+    # Taken names by the size of what is, or will be, written there.
+    by_size: dict[int | None, list[Path]] = field(default_factory=dict)
+
+
+class DestinationIndex:
+    """In-memory listing of destination folders.
+
+    Each folder is listed once, on first use, and name lookups are answered
+    from memory afterwards. On network shares this replaces one stat round
+    trip per candidate name with one directory listing per folder.
+
+    Names are only ever added, by the listing or by reserve(), so the index
+    also remembers, per folder and name, the first _N suffix that may be
+    free. A folder holding a thousand DSC_0001_N files is walked once, not
+    once per file that collides there.
+    """
+
+    def __init__(self):
+        self._names: dict[Path, set[str]] = {}
+        self._present: set[Path] = set()
+        # Keyed by (folder, stem, suffix), the last two normcased.
+        self._series: dict[tuple[Path, str, str], _NameSeries] = {}
+        # Size of the content planned for each reserved path, if known.
+        self._reserved: dict[Path, int | None] = {}
+
+    def _listing(self, folder: Path) -> set[str]:
+        names = self._names.get(folder)
+        if names is None:
+            try:
+                names = {os.path.normcase(name) for name in os.listdir(folder)}
+                self._present.add(folder)
+            except OSError:
+                names = set()
+            self._names[folder] = names
+        return names
+
+    def exists(self, path: Path) -> bool:
+        return os.path.normcase(path.name) in self._listing(path.parent)
+
+    def holds(self, path: Path, size: int) -> bool:
+        """Whether path exists with the given size. Costs a stat if it is listed."""
+        if not self.exists(path):
+            return False
+        try:
+            return os.stat(path).st_size == size
+        except OSError:
+            return False
+
+    def reserve(self, path: Path, size: int | None = None) -> None:
+        """Count path as taken from now on, though nothing is written there yet.
+
+        size is that of the file headed there; None if it is not known, in
+        which case nothing is ever reported as a duplicate of it.
+        """
+        self._listing(path.parent).add(os.path.normcase(path.name))
+        self._reserved[path] = size
+
+    def _size(self, path: Path) -> int | None:
+        if path in self._reserved:
+            return self._reserved[path]
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return None
+
+    def unique_path(
+        self,
+        dest: Path,
+        size: int | None = None,
+        is_duplicate: Callable[[Path], bool] | None = None,
+    ) -> Path | None:
+        """Return dest, or the first free name made by appending _1, _2, etc.
+
+        The name is not reserved; call reserve() once it is used. If
+        is_duplicate is given, it is asked about the taken names holding
+        size bytes (every taken name when size is None); when it reports
+        one already holds the same content, None is returned instead.
+        """
+        stem, suffix, parent = dest.stem, dest.suffix, dest.parent
+        key = (parent, os.path.normcase(stem), os.path.normcase(suffix))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _NameSeries()
+        names = self._listing(parent)
+        while True:
+            candidate = dest
+            if series.next:
+                candidate = parent / f"{stem}_{series.next}{suffix}"
+            if os.path.normcase(candidate.name) not in names:
+                break
+            series.by_size.setdefault(self._size(candidate), []).append(candidate)
+            series.next += 1
+
+        if is_duplicate is not None:
+            if size is None:
+                taken = [path for paths in series.by_size.values() for path in paths]
+            else:
+                taken = series.by_size.get(size, [])
+            if any(map(is_duplicate, taken)):
+                return None
+        return candidate
+
+    def create_dirs(self, folders: set[Path]) -> dict[Path, str]:
+        """Create every missing folder in one pass. Return {folder: error} for failures."""
+        failed: dict[Path, str] = {}
+        for folder in sorted(folders):
+            self._listing(folder)
+            if folder in self._present:
+                continue
+            try:
+                os.makedirs(folder, exist_ok=True)
+                self._present.add(folder)
+            except OSError as e:
+                failed[folder] = str(e)
+        return failed
+
+
+def _group_folder(base_dir: Path, group: Group) -> Path:
+    """Folder a group's files go to: base/YYYY/MM/DD_GroupName."""
     first = group.first_date
     year = f"{first.year:04d}"
     month = f"{first.month:02d}"
     day_folder = f"{first.day:02d}_{group.name}"
-    return base_dir / year / month / day_folder / filename
+    return base_dir / year / month / day_folder
+
+
+def _load_fallocate():
+    """Return libc's fallocate(2), or None where it is not available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fallocate = getattr(libc, "fallocate64", None) or libc.fallocate
+    except (OSError, AttributeError):
+        return None
+    fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+    fallocate.restype = ctypes.c_int
+    return fallocate
+
+
+_fallocate = _load_fallocate()
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve size bytes for fd where the filesystem can do so natively.
+
+    os.posix_fallocate is avoided: where the filesystem has no fallocate
+    (exFAT, NTFS-3g, CIFS) glibc emulates it by writing every block, and
+    vfat zero-fills, so each video would be written twice. fallocate(2)
+    with FALLOC_FL_KEEP_SIZE is never emulated; it fails with EOPNOTSUPP
+    instead, and the copy just goes ahead without it.
+    """
+    if size < PREALLOCATE_MIN or _fallocate is None:
+        return
+    _fallocate(fd, FALLOC_FL_KEEP_SIZE, 0, size)
+
+
+def _kernel_copy(
+    fd_in: int,
+    fd_out: int,
+    size: int,
+    on_bytes: Callable[[int], None] | None = None,
+) -> int | None:
+    """Copy size bytes in the kernel. Return bytes copied, or None if unsupported.
+
+    A syscall that copies nothing on its first call counts as unsupported:
+    some FUSE and virtual filesystems report 0 bytes rather than an error.
+    on_bytes is called with the size of every chunk copied.
+    """
+    chunk = COPY_CHUNK if on_bytes is None else PROGRESS_CHUNK
+    for syscall in ("copy_file_range", "sendfile"):
+        copy = getattr(os, syscall, None)
+        if copy is None:
+            continue
+        copied = 0
+        try:
+            while copied < size:
+                if syscall == "copy_file_range":
+                    n = copy(fd_in, fd_out, min(chunk, size - copied))
+                else:
+                    n = copy(fd_out, fd_in, copied, min(chunk, size - copied))
+                if n == 0:
+                    break
+                copied += n
+                if on_bytes:
+                    on_bytes(n)
+        except OSError as e:
+            if copied == 0 and e.errno in _UNSUPPORTED_COPY_ERRNOS:
+                continue
+            raise
+        if copied == 0 and size > 0:
+            continue
+        return copied
+    return None
+
+
+def _drop_cache(fd: int) -> None:
+    """Evict a synced file from the page cache so it is re-read from disk."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+def _buffered_copy(fsrc, fdst, on_bytes: Callable[[int], None] | None = None) -> int:
+    """Copy between open files through a buffer; return the bytes copied."""
+    buf = bytearray(VERIFY_BUFFER)
+    view = memoryview(buf)
+    copied = 0
+    while n := fsrc.readinto(buf):
+        fdst.write(view[:n])
+        copied += n
+        if on_bytes:
+            on_bytes(n)
+    return copied
+
+
+def _hashing_copy(
+    src: str, dst: str, on_bytes: Callable[[int], None] | None = None
+) -> str:
+    """Copy src to dst in one pass, hashing the data as it streams through."""
+    digest = hashlib.sha256()
+    buf = bytearray(VERIFY_BUFFER)
+    view = memoryview(buf)
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        _preallocate(fdst.fileno(), size)
+        copied = 0
+        while n := fsrc.readinto(buf):
+            digest.update(view[:n])
+            fdst.write(view[:n])
+            copied += n
+            if on_bytes:
+                on_bytes(n)
+        if copied == size:
+            fdst.flush()
+            os.fsync(fdst.fileno())
+            _drop_cache(fdst.fileno())
+    if copied != size:
+        os.unlink(dst)
+        raise OSError(f"Copied {copied} of {size} bytes: {src}")
+    shutil.copystat(src, dst)
+    return digest.hexdigest()
+
+
+def _copy_file(
+    src: str,
+    dst: str,
+    verify: bool = False,
+    on_bytes: Callable[[int], None] | None = None,
+) -> str | None:
+    """Copy data and metadata like shutil.copy2, letting the kernel move the bytes.
+
+    On Linux this uses copy_file_range (or sendfile) in large chunks after
+    preallocating the destination, or a buffered copy when neither syscall
+    works between the two filesystems. Elsewhere it is plain shutil.copy2.
+
+    With verify, the data is instead hashed while it is copied and the
+    destination is read back from disk and checked against that digest.
+    A mismatching copy is deleted and raised as an OSError, as is one that
+    ends short of the source's size.
+
+    on_bytes, if given, is called with each chunk's size as the data is
+    copied, except by shutil.copy2.
+
+    Returns:
+        The SHA-256 hex digest of the data when verifying, else None.
+    """
+    if verify:
+        digest = _hashing_copy(src, dst, on_bytes)
+        if full_hash(dst).hex() != digest:
+            os.unlink(dst)
+            raise OSError(f"Checksum mismatch after copy: {dst}")
+        return digest
+
+    if not sys.platform.startswith("linux"):
+        shutil.copy2(src, dst)
+        return None
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        _preallocate(fdst.fileno(), size)
+        copied = _kernel_copy(fsrc.fileno(), fdst.fileno(), size, on_bytes)
+        if copied is None:
+            copied = _buffered_copy(fsrc, fdst, on_bytes)
+    if copied != size:
+        # The source changed size under us, or the filesystem stopped short.
+        # A move must not go on to delete the source.
+        os.unlink(dst)
+        raise OSError(f"Copied {copied} of {size} bytes: {src}")
+    shutil.copystat(src, dst)
+    return None
+
+
+def _move_file(
+    src: str,
+    dst: str,
+    verify: bool = False,
+    on_bytes: Callable[[int], None] | None = None,
+) -> str | None:
+    """Move src to dst: a rename on the same filesystem, copy and delete otherwise.
+
+    With verify, a cross-filesystem move deletes the source only after the
+    copy matched its checksum. Returns the SHA-256 hex digest when verifying.
+    """
+    try:
+        same_fs = os.stat(src).st_dev == os.stat(os.path.dirname(dst)).st_dev
+    except OSError:
+        same_fs = False
+    if same_fs:
+        try:
+            os.rename(src, dst)
+        except OSError:
+            pass
+        else:
+            # A rename moves no data; hash only to fill in the manifest.
+            return full_hash(dst).hex() if verify else None
+    digest = _copy_file(src, dst, verify, on_bytes)
+    os.unlink(src)
+    return digest
+
+
+class _ManifestWriter:
+    """Appends "digest  filename" lines to each group folder's manifest."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Names listed in each folder's manifest, read on first use.
+        self._listed: dict[Path, set[str]] = {}
+
+    def _names(self, folder: Path) -> set[str]:
+        names = self._listed.get(folder)
+        if names is None:
+            names = set()
+            try:
+                with open(folder / MANIFEST_NAME, encoding="utf-8") as f:
+                    for line in f:
+                        _digest, sep, name = line.rstrip("\n").partition("  ")
+                        if sep:
+                            names.add(name)
+            except OSError:
+                pass
+            self._listed[folder] = names
+        return names
+
+    def add(self, dest: Path, digest: str) -> None:
+        with self._lock:
+            names = self._names(dest.parent)
+            with open(dest.parent / MANIFEST_NAME, "a", encoding="utf-8") as f:
+                f.write(f"{digest}  {dest.name}\n")
+            names.add(dest.name)
+
+    def lists(self, dest: Path) -> bool:
+        with self._lock:
+            return dest.name in self._names(dest.parent)
+
+
+def _plan_transfer(
+    groups: list[Group],
+    photo_dest: Path,
+    video_dest: Path,
+    previous: JournalState | None = None,
+    index: DestinationIndex | None = None,
+) -> list[TransferTask]:
+    """Resolve every destination path up front.
+
+    Names are reserved as they are assigned, so concurrent workers never
+    race for the same file name in a shared folder. Files planned by a
+    previous run keep their destination as long as it is still in the same
+    group folder, so resuming never spreads _1, _2 duplicates. A file the
+    journal records as done only counts as done while its destination is
+    still there with the right size; otherwise it is transferred again.
+    Only files the journal records as started are compared with their
+    destination before that; the others were never written.
+
+    When a name is taken, the file is compared with what holds it (a file
+    on disk, or another source file planned for it in this run). Identical
+    content is marked as a duplicate rather than renamed, which catches
+    re-imported cards and the backup copies some cameras write to DCIM.
+    """
+    previous = previous or JournalState()
+    index = index or DestinationIndex()
+    # Destination -> source file planned to be written there. Paths kept
+    # from an earlier run map to None: they may be half written, so they
+    # are never compared against.
+    owners: dict[Path, Path | None] = dict.fromkeys(previous.plans.values())
+    for path in owners:
+        index.reserve(path)
+    comparer = ContentComparer()
+
+    def duplicate_check(source: Path) -> Callable[[Path], bool]:
+        def is_duplicate(candidate: Path) -> bool:
+            if candidate in owners:
+                other = owners[candidate]
+                return other is not None and comparer.same(source, other)
+            return comparer.same(source, candidate)
+        return is_duplicate
+
+    # Destination stem given to the first file planned from each source
+    # folder and stem. Its siblings reuse it, so a RAW+JPEG pair renamed
+    # on a collision stays a pair: DSC_0001_1.JPG and DSC_0001_1.NEF.
+    sibling_stems: dict[tuple[Path, str], str] = {}
+
+    tasks: list[TransferTask] = []
+    for group in groups:
+        # Both folders are fixed for the group; only the filename varies.
+        folders = {
+            "photo": _group_folder(photo_dest, group),
+            "video": _group_folder(video_dest, group),
+        }
+        for file_info in group.files:
+            dest_path = folders[file_info.file_type] / file_info.filename
+            stem_key = os.path.splitext(file_info.filename)[0].lower()
+            sibling = (file_info.path.parent, stem_key)
+            stem = sibling_stems.get(sibling)
+            if stem is not None:
+                dest_path = dest_path.with_name(stem + dest_path.suffix)
+            key = journal_key(file_info.path, file_info.size, file_info.mtime_ns)
+            planned = previous.plans.get(key)
+            if planned is not None and planned.parent == dest_path.parent:
+                tasks.append(
+                    TransferTask(
+                        file_info=file_info,
+                        dest=planned,
+                        resumed=True,
+                        started=key in previous.started,
+                        done=key in previous.done
+                        and index.holds(planned, file_info.size),
+                    )
+                )
+                sibling_stems.setdefault(sibling, planned.stem)
+                continue
+            unique = index.unique_path(
+                dest_path, file_info.size, duplicate_check(file_info.path)
+            )
+            if unique is None:
+                tasks.append(
+                    TransferTask(file_info=file_info, dest=dest_path, duplicate=True)
+                )
+                sibling_stems.setdefault(sibling, dest_path.stem)
+                continue
+            owners[unique] = file_info.path
+            index.reserve(unique, file_info.size)
+            tasks.append(TransferTask(file_info=file_info, dest=unique))
+            sibling_stems.setdefault(sibling, unique.stem)
+    return tasks
+
+
+def _already_transferred(task: TransferTask, mode: str) -> bool:
+    """Check a file an earlier run may have been transferring when it stopped.
+
+    Only files the journal records as started and not done, or as done
+    but not found intact, get here, so the full comparison is limited to
+    the few files that were in flight.
+    """
+    src = task.file_info.path
+    dest = task.dest
+    if not dest.exists():
+        return False
+    if not src.exists():
+        # Move mode only deletes the source after the copy completed.
+        return mode == "move"
+    if not filecmp.cmp(src, dest, shallow=False):
+        return False
+    if mode == "move":
+        os.unlink(src)
+    else:
+        shutil.copystat(src, dest)
+    return True
+
+
+def _close_quietly(journal: TransferJournal) -> None:
+    try:
+        journal.close()
+    except OSError:
+        pass
 
 
 def execute_transfer(
@@ -39,46 +558,209 @@ def execute_transfer(
     video_dest: str | Path,
     mode: str,
     callback: Callable[[int, int, str], None] | None = None,
+    concurrency: int | dict[str | Path, int] = DEFAULT_QUEUE_CONCURRENCY,
+    resume: bool = True,
+    verify: bool = True,
+    progress: TransferProgress | None = None,
 ) -> dict:
     """Transfer files from groups to destination directories.
 
+    Files are queued per source device and destination device, and each
+    queue runs its own workers: a photo disk and a video disk are written
+    in parallel, and so several cards are read in parallel, each at its
+    own pace.
+
     Args:
         groups: List of Group objects containing files to transfer.
         photo_dest: Base directory for photos.
         video_dest: Base directory for videos.
         mode: "copy" or "move".
-        callback: Called with (current_file_index, total_files, filename)
-            after each file is processed.
+        callback: Called with (files_done, total_files, filename) after each
+            file is processed. Calls are serialized and files_done increases
+            by one each time, whichever worker finished the file.
+        concurrency: Workers per queue, either one number for every queue
+            or a mapping from destination base directory to its count.
+            When photos and videos share a device, the larger count wins.
+        resume: Keep a journal in photo_dest so that rerunning an
+            interrupted transfer skips completed files still found at their
+            destination and re-verifies the ones that were in flight. The
+            journal is deleted once a run finishes without errors.
+        verify: Hash every file while copying it, check the written copy
+            against that digest before a move deletes the original, and
+            record the digests in a SHA256SUMS manifest in each group
+            folder. Without it, copies go through the kernel fast path.
+        progress: Byte-based progress tracker, told the totals once the
+            transfer is planned, the bytes as they are copied and every file
+            as it completes. Unlike callback, it throttles its own updates.
 
     Returns:
-        Dict with keys: "transferred", "errors" (list of (filename, error_msg)).
+        Dict with keys: "transferred", "skipped" (files completed by a
+        previous run), "duplicates" (files left untouched because identical
+        content was already at or headed for their destination), "errors"
+        (list of (filename, error_msg)).
     """
     photo_dest = Path(photo_dest)
     video_dest = Path(video_dest)
-    transfer_fn = shutil.copy2 if mode == "copy" else shutil.move
+    transfer_fn = _copy_file if mode == "copy" else _move_file
+    manifests = _ManifestWriter() if verify else None
 
-    all_files: list[tuple[Group, FileInfo]] = []
-    for group in groups:
-        for file_info in group.files:
-            all_files.append((group, file_info))
+    # The journal is a convenience: when photo_dest cannot hold one, the
+    # transfer goes ahead without it and its files fail one by one.
+    journal = TransferJournal(photo_dest / JOURNAL_NAME) if resume else None
+    previous = None
+    if journal:
+        try:
+            previous = journal.load()
+        except OSError:
+            journal = None
+    index = DestinationIndex()
+    tasks = _plan_transfer(groups, photo_dest, video_dest, previous, index)
+    failed_dirs = index.create_dirs(
+        {task.dest.parent for task in tasks if not (task.done or task.duplicate)}
+    )
+    if journal:
+        try:
+            journal.record_plan(
+                [
+                    (
+                        task.file_info.path,
+                        task.file_info.size,
+                        task.file_info.mtime_ns,
+                        task.dest,
+                    )
+                    for task in tasks
+                    if not task.resumed and not task.duplicate
+                ]
+            )
+        except OSError:
+            _close_quietly(journal)
+            journal = None
+
+    devices = {"photo": device_of(photo_dest), "video": device_of(video_dest)}
+    workers: dict[int | str, int] = {}
+    for file_type, base in (("photo", photo_dest), ("video", video_dest)):
+        if isinstance(concurrency, dict):
+            count = concurrency.get(
+                base, concurrency.get(str(base), DEFAULT_QUEUE_CONCURRENCY)
+            )
+        else:
+            count = concurrency
+        device = devices[file_type]
+        workers[device] = max(workers.get(device, 1), count)
 
-    total = len(all_files)
+    total = len(tasks)
+    done = 0
     transferred = 0
+    skipped = 0
+    duplicates = 0
     errors: list[tuple[str, str]] = []
+    lock = threading.Lock()
+    if progress:
+        progress.start(total, sum(task.file_info.size for task in tasks))
 
-    for idx, (group, file_info) in enumerate(all_files):
-        base = photo_dest if file_info.file_type == "photo" else video_dest
-        dest_path = _build_dest_path(base, group, file_info.filename)
-        dest_path = _unique_path(dest_path)
+    source_devices: dict[Path, int | str] = {}  # source folder -> device
+    queues: dict[tuple[int | str, int | str], list[TransferTask]] = {}
+    for task in tasks:
+        if task.done or task.duplicate:
+            done += 1
+            if task.duplicate:
+                duplicates += 1
+            else:
+                skipped += 1
+            if callback:
+                callback(done, total, task.file_info.filename)
+            if progress:
+                progress.file_done(
+                    task.file_info.size, task.file_info.filename, transferred=False
+                )
+            continue
+        folder = task.file_info.path.parent
+        source = source_devices.get(folder)
+        if source is None:
+            source = source_devices[folder] = device_of(folder)
+        key = (source, devices[task.file_info.file_type])
+        queues.setdefault(key, []).append(task)
 
+    def run(task: TransferTask):
+        nonlocal done, transferred, skipped
+        file_info = task.file_info
+        error = None
+        resumed = False
+        streamed = 0
+
+        def on_bytes(n: int) -> None:
+            nonlocal streamed
+            streamed += n
+            progress.add_bytes(n, file_info.filename)
         try:
-            os.makedirs(dest_path.parent, exist_ok=True)
-            transfer_fn(str(file_info.path), str(dest_path))
-            transferred += 1
+            if journal:
+                journal.record_start(file_info.path, file_info.size, file_info.mtime_ns)
+            if task.dest.parent in failed_dirs:
+                raise OSError(failed_dirs[task.dest.parent])
+            if task.started and _already_transferred(task, mode):
+                resumed = True
+                # The earlier run may have stopped before listing it.
+                if manifests and not manifests.lists(task.dest):
+                    manifests.add(task.dest, full_hash(task.dest).hex())
+            else:
+                digest = transfer_fn(
+                    str(file_info.path),
+                    str(task.dest),
+                    verify,
+                    on_bytes if progress else None,
+                )
+                if manifests and digest:
+                    manifests.add(task.dest, digest)
+            if journal:
+                journal.record_done(file_info.path, file_info.size, file_info.mtime_ns)
         except Exception as e:
-            errors.append((file_info.filename, str(e)))
+            error = str(e)
+
+        with lock:
+            done += 1
+            if error is not None:
+                errors.append((file_info.filename, error))
+            elif resumed:
+                skipped += 1
+            else:
+                transferred += 1
+            if callback:
+                callback(done, total, file_info.filename)
+        if progress:
+            moved = error is None and not resumed
+            progress.file_done(
+                file_info.size, file_info.filename, transferred=moved, streamed=streamed
+            )
 
-        if callback:
-            callback(idx + 1, total, file_info.filename)
+    pools = [
+        ThreadPoolExecutor(max_workers=max(1, workers[device]))
+        for _source, device in queues
+    ]
+    try:
+        futures = [
+            pool.submit(run, task)
+            for pool, queue in zip(pools, queues.values())
+            for task in queue
+        ]
+        wait(futures)
+        for future in futures:
+            future.result()
+    finally:
+        for pool in pools:
+            pool.shutdown(wait=True)
+        if journal:
+            _close_quietly(journal)
+        if progress:
+            progress.finish()
 
-    return {"transferred": transferred, "errors": errors}
+    if journal and not errors:
+        try:
+            journal.remove()
+        except OSError:
+            pass
+    return {
+        "transferred": transferred,
+        "skipped": skipped,
+        "duplicates": duplicates,
+        "errors": errors,
+    }
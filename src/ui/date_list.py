@@ -0,0 +1,208 @@
+"""Virtualized, scrollable list of date rows for the grouping step."""
+
+import bisect
+import heapq
+from collections.abc import Callable
+from datetime import date
+
+import customtkinter as ctk
+
+ROW_HEIGHT = 76
+
+
+def _row_text(d: date, photos: int, videos: int) -> str:
+    return f"{d.strftime('%Y-%m-%d')}   —   {photos} photo(s), {videos} vidéo(s)"
+
+
+class _Row(ctk.CTkFrame):
+    """One reusable row widget, rebound to whichever date scrolls into its slot."""
+
+    def __init__(self, parent, on_toggle: Callable[["_Row"], None]):
+        super().__init__(parent, height=ROW_HEIGHT - 4)
+        self.date: date | None = None
+        self.var = ctk.BooleanVar(value=False)
+        self.grid_propagate(False)
+        self.grid_rowconfigure(0, weight=1)
+
+        ctk.CTkCheckBox(
+            self, text="", variable=self.var, width=30, command=lambda: on_toggle(self)
+        ).grid(row=0, column=0, padx=(5, 0))
+        self.thumb = ctk.CTkLabel(self, text="")
+        self.thumb.grid(row=0, column=1, padx=5)
+        self.thumb.grid_remove()
+        self.label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=13))
+        self.label.grid(row=0, column=2, padx=10, sticky="w")
+
+
+class VirtualDateList(ctk.CTkFrame):
+    """Scrollable date list that only creates widgets for the visible rows.
+
+    Dates, counts, check state and thumbnails live in plain containers;
+    a small pool of row widgets is rebound to them on scroll, so adding,
+    removing or redrawing dates costs the same for ten dates or ten
+    thousand.
+    """
+
+    def __init__(self, parent, label_text: str = ""):
+        super().__init__(parent)
+        self._dates: list[date] = []
+        self._counts: dict[date, tuple[int, int]] = {}
+        self._checked: set[date] = set()
+        self._thumbs: dict[date, ctk.CTkImage] = {}
+        self._rows: list[_Row] = []
+        self._offset = 0
+        # Called with the dates that became visible, e.g. to fetch thumbnails.
+        self.on_visible: Callable[[list[date]], None] | None = None
+
+        if label_text:
+            ctk.CTkLabel(
+                self, text=label_text, font=ctk.CTkFont(size=13, weight="bold")
+            ).pack(fill="x", pady=(4, 2))
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(fill="both", expand=True, padx=4, pady=(0, 4))
+        self._scrollbar = ctk.CTkScrollbar(body, command=self._on_scrollbar)
+        self._scrollbar.pack(side="right", fill="y")
+        self._viewport = ctk.CTkFrame(body, fg_color="transparent")
+        self._viewport.pack(side="left", fill="both", expand=True)
+
+        self._viewport.bind("<Configure>", lambda _e: self._render())
+        self.bind_all("<MouseWheel>", self._on_wheel, add="+")
+        self.bind_all("<Button-4>", self._on_wheel, add="+")
+        self.bind_all("<Button-5>", self._on_wheel, add="+")
+
+    # --- Model updates ---
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def __contains__(self, d: date) -> bool:
+        return d in self._counts
+
+    def set_dates(self, counts: dict[date, tuple[int, int]]):
+        """Replace every date. counts maps date -> (photos, videos)."""
+        self._dates = sorted(counts)
+        self._counts = dict(counts)
+        self._checked.clear()
+        self._thumbs.clear()
+        self._offset = 0
+        self._render()
+
+    def upsert(self, d: date, photos: int, videos: int):
+        """Add a date in sorted position, or update its counts."""
+        self.upsert_many({d: (photos, videos)})
+
+    def upsert_many(self, counts: dict[date, tuple[int, int]]):
+        """Add or update several dates, merged in one pass and drawn once."""
+        new = sorted(d for d in counts if d not in self._counts)
+        if len(new) == 1:
+            bisect.insort(self._dates, new[0])
+        elif new:
+            self._dates = list(heapq.merge(self._dates, new))
+        self._counts.update(counts)
+        self._render()
+
+    def remove(self, dates: list[date]):
+        for d in dates:
+            if d not in self._counts:
+                continue
+            del self._dates[bisect.bisect_left(self._dates, d)]
+            del self._counts[d]
+            self._checked.discard(d)
+            self._thumbs.pop(d, None)
+        self._render()
+
+    def set_thumbnail(self, d: date, image: ctk.CTkImage):
+        if d not in self._counts:
+            return
+        self._thumbs[d] = image
+        for row in self._rows:
+            if row.date == d:
+                row.thumb.configure(image=image)
+                row.thumb.grid()
+
+    def is_visible(self, d: date) -> bool:
+        return any(row.date == d for row in self._rows)
+
+    def has_thumbnail(self, d: date) -> bool:
+        return d in self._thumbs
+
+    def checked(self) -> list[date]:
+        return sorted(self._checked)
+
+    # --- Rendering ---
+
+    def _max_offset(self) -> int:
+        return max(0, len(self._dates) * ROW_HEIGHT - self._viewport.winfo_height())
+
+    def _render(self):
+        height = max(self._viewport.winfo_height(), 1)
+        self._offset = min(self._offset, self._max_offset())
+        needed = height // ROW_HEIGHT + 2
+        while len(self._rows) < needed:
+            self._rows.append(_Row(self._viewport, self._toggle))
+
+        first = self._offset // ROW_HEIGHT
+        shift = self._offset % ROW_HEIGHT
+        newly_visible = []
+        for i, row in enumerate(self._rows):
+            index = first + i
+            if i >= needed or index >= len(self._dates):
+                row.date = None
+                row.place_forget()
+                continue
+            d = self._dates[index]
+            if row.date != d:
+                row.date = d
+                row.var.set(d in self._checked)
+                image = self._thumbs.get(d)
+                if image is None:
+                    row.thumb.grid_remove()
+                    newly_visible.append(d)
+                else:
+                    row.thumb.configure(image=image)
+                    row.thumb.grid()
+            row.label.configure(text=_row_text(d, *self._counts[d]))
+            row.place(x=0, y=i * ROW_HEIGHT - shift, relwidth=1.0)
+
+        total = len(self._dates) * ROW_HEIGHT
+        if total <= height:
+            self._scrollbar.set(0.0, 1.0)
+        else:
+            self._scrollbar.set(self._offset / total, (self._offset + height) / total)
+        if newly_visible and self.on_visible:
+            self.on_visible(newly_visible)
+
+    def _toggle(self, row: _Row):
+        if row.date is None:
+            return
+        if row.var.get():
+            self._checked.add(row.date)
+        else:
+            self._checked.discard(row.date)
+
+    # --- Scrolling ---
+
+    def _scroll_to(self, offset: int):
+        offset = max(0, min(int(offset), self._max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _on_scrollbar(self, action: str, *args):
+        if action == "moveto":
+            self._scroll_to(float(args[0]) * len(self._dates) * ROW_HEIGHT)
+        elif action == "scroll":
+            amount = int(args[0])
+            step = self._viewport.winfo_height() if args[1] == "pages" else ROW_HEIGHT
+            self._scroll_to(self._offset + amount * step)
+
+    def _on_wheel(self, event):
+        if not str(event.widget).startswith(str(self._viewport)):
+            return
+        if event.num == 4:
+            delta = -1
+        elif event.num == 5:
+            delta = 1
+        else:
+            delta = -1 if event.delta > 0 else 1
+        self._scroll_to(self._offset + delta * ROW_HEIGHT)
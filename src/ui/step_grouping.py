@@ -1,42 +1,33 @@
 """Step 3: Scan source, display dates, let user create named groups."""
 
-import io
 import threading
-from datetime import date
+from collections.abc import Sequence
+from datetime import date, timedelta
 
 import customtkinter as ctk
-from PIL import Image
 
-from src.scanner import (
-    FileInfo,
-    Group,
-    count_for_date,
-    scan_directory,
-)
+from src.cache import open_default_cache
+from src.catalog import Catalog
+from src.filestore import FileInfo
+from src.scanner import Group, ScanBatch, SourceListing, iter_scan_sources
+from src.sessions import DEFAULT_GAP, propose_groups
+from src.thumbnails import THUMB_SIZE, ThumbnailService
+from src.ui.date_list import VirtualDateList
 
-
-THUMB_SIZE = (64, 64)
-
-
-def _load_thumbnail(files: list[FileInfo]) -> ctk.CTkImage | None:
-    """Try to generate a thumbnail from the first photo in the list."""
-    for f in files:
-        if f.file_type == "photo" and f.path.suffix.lower() in (".jpg", ".jpeg"):
-            try:
-                img = Image.open(f.path)
-                img.thumbnail(THUMB_SIZE)
-                return ctk.CTkImage(light_image=img, dark_image=img, size=THUMB_SIZE)
-            except Exception:
-                continue
-    return None
+# Name of proposed groups when the name field is empty.
+DEFAULT_SESSION_NAME = "Séance"
 
 
 class StepGrouping(ctk.CTkFrame):
     def __init__(self, parent, state):
         super().__init__(parent, fg_color="transparent")
         self.state = state
-        self.check_vars: dict[date, ctk.BooleanVar] = {}
-        self.date_rows: dict[date, ctk.CTkFrame] = {}
+        # Dates whose thumbnail is shown or being generated.
+        self.date_thumbs: set[date] = set()
+        # Row widget per created group, keyed by id(group).
+        self.group_rows: dict[int, ctk.CTkFrame] = {}
+        self.thumbnails = ThumbnailService()
+        self._scan_id = 0
 
         # Title
         ctk.CTkLabel(
@@ -60,6 +51,10 @@ class StepGrouping(ctk.CTkFrame):
         ).pack(anchor="w", padx=10, pady=(5, 2))
         self.groups_list_frame = ctk.CTkFrame(self.groups_frame, fg_color="transparent")
         self.groups_list_frame.pack(fill="x", padx=10, pady=(0, 5))
+        self.no_groups_label = ctk.CTkLabel(
+            self.groups_list_frame, text="Aucun groupe.", text_color="gray"
+        )
+        self.no_groups_label.pack(anchor="w")
 
         # Action bar
         action_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -75,14 +70,27 @@ class StepGrouping(ctk.CTkFrame):
         )
         self.btn_create_group.pack(side="left")
 
+        self.btn_propose = ctk.CTkButton(
+            action_frame,
+            text="Grouper par séance",
+            command=self._propose_groups,
+            width=150,
+        )
+        self.btn_propose.pack(side="left", padx=(10, 0))
+        ctk.CTkLabel(action_frame, text="Pause (h) :").pack(side="left", padx=(10, 4))
+        self.gap_entry = ctk.CTkEntry(action_frame, width=50)
+        self.gap_entry.insert(0, f"{DEFAULT_GAP.total_seconds() / 3600:g}")
+        self.gap_entry.pack(side="left")
+
         self.group_error_label = ctk.CTkLabel(
             action_frame, text="", font=ctk.CTkFont(size=12), text_color="red"
         )
         self.group_error_label.pack(side="left", padx=10)
 
-        # Scrollable date list
-        self.scroll_frame = ctk.CTkScrollableFrame(self, label_text="Dates détectées")
-        self.scroll_frame.pack(fill="both", expand=True, padx=15, pady=(5, 5))
+        # Scrollable date list; only the visible rows have widgets
+        self.date_list = VirtualDateList(self, label_text="Dates détectées")
+        self.date_list.pack(fill="both", expand=True, padx=15, pady=(5, 5))
+        self.date_list.on_visible = self._on_dates_visible
 
         # Info at bottom
         self.bottom_label = ctk.CTkLabel(
@@ -90,58 +98,173 @@ class StepGrouping(ctk.CTkFrame):
         )
         self.bottom_label.pack(pady=(0, 5))
 
+    def destroy(self):
+        # Queued thumbnails would hold up exit, then call back into
+        # destroyed widgets.
+        self.thumbnails.shutdown()
+        super().destroy()
+
     def on_enter(self):
-        """Called when this step becomes visible — trigger scan."""
-        self.status_label.configure(text="Scan en cours…", text_color="gray")
-        self.state.groups.clear()
-        self._refresh_groups_display()
-        # Run scan in background thread
-        threading.Thread(target=self._scan, daemon=True).start()
-
-    def _scan(self):
-        files_by_date = scan_directory(self.state.source_path)
-        self.state.files_by_date = files_by_date
-        self.after(0, lambda: self._populate_dates(files_by_date))
-
-    def _populate_dates(self, files_by_date: dict[date, list[FileInfo]]):
-        # Clear previous
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
-        self.check_vars.clear()
-        self.date_rows.clear()
-
-        sorted_dates = sorted(files_by_date.keys())
-        total_files = sum(len(v) for v in files_by_date.values())
-        self.status_label.configure(
-            text=f"{len(sorted_dates)} date(s), {total_files} fichier(s) détecté(s).",
-            text_color="#2FA572",
-        )
+        """Called when this step becomes visible — reuse or (re)scan the sources."""
+        self.btn_create_group.configure(state="disabled")
+        self.btn_propose.configure(state="disabled")
+        self._scan_id += 1
+        threading.Thread(target=self._scan, args=(self._scan_id,), daemon=True).start()
+
+    def _scan(self, scan_id: int):
+        # Runs in its own thread: a failure must reach the UI, or the step
+        # would wait on "Scan en cours…" forever.
+        try:
+            self._run_scan(scan_id)
+        except Exception:
+            self.after(0, lambda: self._on_scan_failed(scan_id))
+
+    def _run_scan(self, scan_id: int):
+        paths = list(self.state.source_paths)
+        listings = [self.state.listing_for(path).result() for path in paths]
+        if scan_id != self._scan_id:
+            return
+        scanned = self.state.scanned_listings
+        if scanned is not None and len(scanned) == len(listings) and all(
+            a is b for a, b in zip(scanned, listings)
+        ):
+            # Unchanged sources: keep the dates and groups built last time.
+            self.after(0, lambda: self._on_scan_reused(scan_id))
+            return
 
-        for d in sorted_dates:
-            files = files_by_date[d]
-            photos, videos = count_for_date(files)
-            var = ctk.BooleanVar(value=False)
-            self.check_vars[d] = var
+        self.after(0, lambda: self._show_scanning(scan_id))
+        prescanned = None
+        if len(paths) == 1:
+            prescanned = self.state.take_prescan(paths[0], listings[0])
+        # Any other prescan is of no use now; stop it rather than let it
+        # compete with the scan for the card.
+        self.state.drop_prescans()
+        if prescanned is not None:
+            # Scanned in the background since the card was mounted.
+            self.after(0, lambda: self._load_catalog(scan_id, listings, prescanned))
+            return
 
-            row = ctk.CTkFrame(self.scroll_frame)
-            row.pack(fill="x", pady=2)
-            self.date_rows[d] = row
+        # Created here so the scan can write into its store; _reset installs
+        # it before any batch arrives, as after() callbacks run in order.
+        catalog = Catalog()
+        self.after(0, lambda: self._reset(scan_id, catalog))
+        cache = open_default_cache()
+        try:
+            # Results stream in batch by batch, from every source at once.
+            # With several sources, their prescans have at least warmed
+            # the cache for the files they got to.
+            for batch in iter_scan_sources(listings, cache=cache, store=catalog.store):
+                if scan_id != self._scan_id:
+                    return
+                self.after(0, lambda b=batch: self._add_batch(scan_id, b))
+        finally:
+            if cache is not None:
+                cache.close()
+        self.after(0, lambda: self._on_scan_complete(scan_id, listings))
+
+    def _show_scanning(self, scan_id: int):
+        if scan_id == self._scan_id:
+            self.status_label.configure(text="Scan en cours…", text_color="gray")
+
+    def _reset(self, scan_id: int, catalog: Catalog):
+        if scan_id != self._scan_id:
+            return
+        self._show_scanning(scan_id)
+        self.state.catalog = catalog
+        self.state.scanned_listings = None
+        for row in self.group_rows.values():
+            row.destroy()
+        self.group_rows.clear()
+        self.no_groups_label.pack(anchor="w")
+        self.date_thumbs.clear()
+        self.date_list.set_dates({})
+        self._update_bottom_label()
 
-            ctk.CTkCheckBox(row, text="", variable=var, width=30).pack(
-                side="left", padx=(5, 0)
-            )
+    def _add_batch(self, scan_id: int, batch: ScanBatch):
+        if scan_id != self._scan_id:
+            return
+        new_files = self.state.catalog.add(batch.files)
 
-            # Thumbnail
-            thumb = _load_thumbnail(files)
-            if thumb:
-                ctk.CTkLabel(row, image=thumb, text="").pack(side="left", padx=5)
+        self.date_list.upsert_many(batch.counts)
+        for d in batch.counts:
+            if d not in self.date_thumbs and self.date_list.is_visible(d):
+                # An earlier attempt found no usable photo; try the new ones.
+                self._add_thumbnail(d, new_files.get(d, ()))
 
-            info_text = f"{d.strftime('%Y-%m-%d')}   —   {photos} photo(s), {videos} vidéo(s)"
-            ctk.CTkLabel(row, text=info_text, font=ctk.CTkFont(size=13)).pack(
-                side="left", padx=10
-            )
+        self._update_status(done=False)
+        self._update_bottom_label()
 
+    def _load_catalog(
+        self, scan_id: int, listings: list[SourceListing], catalog: Catalog
+    ):
+        """Show a catalog scanned elsewhere in one go."""
+        if scan_id != self._scan_id:
+            return
+        self._reset(scan_id, catalog)
+        self.date_list.set_dates({d: catalog.counts(d) for d in catalog.dates()})
         self._update_bottom_label()
+        self._on_scan_complete(scan_id, listings)
+
+    def _on_scan_complete(self, scan_id: int, listings: list[SourceListing]):
+        if scan_id != self._scan_id:
+            return
+        self.state.scanned_listings = listings
+        self.btn_create_group.configure(state="normal")
+        self.btn_propose.configure(state="normal")
+        self._update_status(done=True)
+
+    def _on_scan_reused(self, scan_id: int):
+        if scan_id == self._scan_id:
+            self.btn_create_group.configure(state="normal")
+            self.btn_propose.configure(state="normal")
+
+    def _on_scan_failed(self, scan_id: int):
+        if scan_id == self._scan_id:
+            self.status_label.configure(
+                text="⚠ Impossible de lire la source.", text_color="red"
+            )
+
+    def _update_status(self, done: bool):
+        n_dates = len(self.state.catalog)
+        total_files = self.state.catalog.total_files
+        if done:
+            self.status_label.configure(
+                text=f"{n_dates} date(s), {total_files} fichier(s) détecté(s).",
+                text_color="#2FA572",
+            )
+        else:
+            self.status_label.configure(
+                text=f"Scan en cours… {n_dates} date(s), {total_files} fichier(s).",
+                text_color="gray",
+            )
+
+    def _on_dates_visible(self, dates: list[date]):
+        for d in dates:
+            if d not in self.date_thumbs:
+                self._add_thumbnail(d, self.state.catalog.files(d))
+
+    def _add_thumbnail(self, d: date, files: Sequence[FileInfo]):
+        """Request a thumbnail in the background; the row is shown without it meanwhile."""
+        self.date_thumbs.add(d)
+        scan_id = self._scan_id
+        self.thumbnails.request(
+            files,
+            lambda img: self.after(0, lambda: self._set_thumbnail(scan_id, d, img)),
+        )
+
+    def _set_thumbnail(self, scan_id: int, d: date, img):
+        if (
+            scan_id != self._scan_id
+            or d not in self.date_list
+            or self.date_list.has_thumbnail(d)
+        ):
+            return
+        if img is None:
+            # Let a later batch of files for this date try again.
+            self.date_thumbs.discard(d)
+            return
+        thumb = ctk.CTkImage(light_image=img, dark_image=img, size=THUMB_SIZE)
+        self.date_list.set_thumbnail(d, thumb)
 
     def _create_group(self):
         name = self.name_entry.get().strip()
@@ -149,82 +272,95 @@ class StepGrouping(ctk.CTkFrame):
             self.group_error_label.configure(text="Entrez un nom de groupe.")
             return
 
-        selected_dates = [d for d, var in self.check_vars.items() if var.get()]
+        selected_dates = self.date_list.checked()
         if not selected_dates:
             self.group_error_label.configure(text="Cochez au moins une date.")
             return
 
         self.group_error_label.configure(text="")
-
-        # Gather files for selected dates
-        group_files: list[FileInfo] = []
-        for d in selected_dates:
-            group_files.extend(self.state.files_by_date[d])
-
-        group = Group(name=name, dates=sorted(selected_dates), files=group_files)
-        self.state.groups.append(group)
-
-        # Remove selected dates from UI and tracking
-        for d in selected_dates:
-            row = self.date_rows.pop(d, None)
-            if row:
-                row.destroy()
-            self.check_vars.pop(d, None)
-            self.state.files_by_date.pop(d, None)
-
+        self._add_group(name, selected_dates)
         self.name_entry.delete(0, "end")
-        self._refresh_groups_display()
         self._update_bottom_label()
 
-    def _refresh_groups_display(self):
-        for widget in self.groups_list_frame.winfo_children():
-            widget.destroy()
-
-        if not self.state.groups:
-            ctk.CTkLabel(
-                self.groups_list_frame, text="Aucun groupe.", text_color="gray"
-            ).pack(anchor="w")
+    def _propose_groups(self):
+        """Group the checked dates, or all remaining ones, by shooting session."""
+        try:
+            hours = float(self.gap_entry.get().strip().replace(",", "."))
+        except ValueError:
+            hours = 0
+        if hours <= 0:
+            self.group_error_label.configure(text="Pause invalide (en heures).")
+            return
+        proposals = propose_groups(
+            self.state.catalog,
+            timedelta(hours=hours),
+            self.date_list.checked() or None,
+        )
+        if not proposals:
+            self.group_error_label.configure(text="Aucune date à regrouper.")
             return
 
-        for i, group in enumerate(self.state.groups):
-            date_str = group.first_date.strftime("%Y/%m/%d")
-            folder_name = f"{group.first_date.strftime('%d')}_{group.name}"
-            n_files = len(group.files)
-            dates_count = len(group.dates)
+        self.group_error_label.configure(text="")
+        # Each proposal becomes an ordinary group: removing one with its ✕
+        # button puts its dates back to be regrouped by hand.
+        name = self.name_entry.get().strip() or DEFAULT_SESSION_NAME
+        for proposal in proposals:
+            self._add_group(name, proposal.dates)
+        self.name_entry.delete(0, "end")
+        self._update_bottom_label()
 
-            row = ctk.CTkFrame(self.groups_list_frame, fg_color="transparent")
-            row.pack(fill="x", pady=1)
+    def _add_group(self, name: str, dates: list[date]):
+        group = self.state.catalog.assign(name, dates)
+
+        # Remove the dates from UI and tracking
+        self.date_list.remove(dates)
+        for d in dates:
+            self.date_thumbs.discard(d)
+        self._add_group_row(group)
+
+    def _add_group_row(self, group: Group):
+        self.no_groups_label.pack_forget()
+        date_str = group.first_date.strftime("%Y/%m/%d")
+        folder_name = f"{group.first_date.strftime('%d')}_{group.name}"
+        n_files = len(group.files)
+        dates_count = len(group.dates)
+
+        row = ctk.CTkFrame(self.groups_list_frame, fg_color="transparent")
+        row.pack(fill="x", pady=1)
+        self.group_rows[id(group)] = row
+
+        text = (
+            f"📂  {date_str[0:4]}/{date_str[5:7]}/{folder_name}"
+            f"   ({dates_count} date(s), {n_files} fichier(s))"
+        )
+        ctk.CTkLabel(row, text=text, font=ctk.CTkFont(size=13)).pack(
+            side="left", padx=5
+        )
 
-            text = (
-                f"📂  {date_str[0:4]}/{date_str[5:7]}/{folder_name}"
-                f"   ({dates_count} date(s), {n_files} fichier(s))"
-            )
-            ctk.CTkLabel(row, text=text, font=ctk.CTkFont(size=13)).pack(
-                side="left", padx=5
-            )
+        ctk.CTkButton(
+            row,
+            text="✕",
+            width=30,
+            fg_color="transparent",
+            hover_color=("gray80", "gray30"),
+            text_color="red",
+            command=lambda: self._remove_group(group),
+        ).pack(side="right")
+
+    def _remove_group(self, group: Group):
+        dates = self.state.catalog.unassign(group)
+        row = self.group_rows.pop(id(group), None)
+        if row is not None:
+            row.destroy()
+        if not self.state.groups:
+            self.no_groups_label.pack(anchor="w")
 
-            ctk.CTkButton(
-                row,
-                text="✕",
-                width=30,
-                fg_color="transparent",
-                hover_color=("gray80", "gray30"),
-                text_color="red",
-                command=lambda idx=i: self._remove_group(idx),
-            ).pack(side="right")
-
-    def _remove_group(self, index: int):
-        group = self.state.groups.pop(index)
-        # Restore dates back to files_by_date and UI
-        for d in group.dates:
-            matching = [f for f in group.files if f.date == d]
-            self.state.files_by_date[d] = matching
-        # Re-populate the dates list
-        self._populate_dates(self.state.files_by_date)
-        self._refresh_groups_display()
+        # Restore the dates to the date list
+        self.date_list.upsert_many({d: self.state.catalog.counts(d) for d in dates})
+        self._update_bottom_label()
 
     def _update_bottom_label(self):
-        remaining = len(self.check_vars)
+        remaining = len(self.date_list)
         if remaining == 0 and self.state.groups:
             self.bottom_label.configure(
                 text="✔ Toutes les dates sont regroupées. Vous pouvez continuer.",
@@ -239,7 +375,7 @@ class StepGrouping(ctk.CTkFrame):
             self.bottom_label.configure(text="")
 
     def validate(self) -> bool:
-        if self.check_vars:
+        if len(self.date_list):
             self.bottom_label.configure(
                 text="⚠ Regroupez toutes les dates avant de continuer.", text_color="red"
             )
@@ -1,5 +1,6 @@
-"""Step 1: Select the source directory (SD card, USB drive, or folder)."""
+"""Step 1: Select the sources (SD cards, USB drives, or folders)."""
 
+import os
 import platform
 import subprocess
 from pathlib import Path
@@ -7,22 +8,31 @@ from tkinter import filedialog
 
 import customtkinter as ctk
 
-from src.scanner import ALL_EXTENSIONS
+from src.mounts import MountPoint, MountWatcher, list_removable_mounts
 
 
 class StepSource(ctk.CTkFrame):
     def __init__(self, parent, state):
         super().__init__(parent, fg_color="transparent")
         self.state = state
+        # Label per selected source, keyed by path.
+        self.source_rows: dict[str, ctk.CTkLabel] = {}
+        # Files found per source once enumerated; None if it is unreadable.
+        self.source_counts: dict[str, int | None] = {}
+        # Sources added because their card was mounted. While the user has
+        # not picked sources by hand, new cards join the session on their own.
+        self._auto_sources: set[str] = set()
+        self._manual = False
 
         # Title
         ctk.CTkLabel(
-            self, text="Sélection de la source", font=ctk.CTkFont(size=20, weight="bold")
+            self, text="Sélection des sources", font=ctk.CTkFont(size=20, weight="bold")
         ).pack(pady=(20, 10))
 
         ctk.CTkLabel(
             self,
-            text="Choisissez le périphérique ou le dossier contenant vos photos et vidéos.",
+            text="Choisissez un ou plusieurs périphériques ou dossiers contenant vos "
+            "photos et vidéos.",
             font=ctk.CTkFont(size=13),
             text_color="gray",
         ).pack(pady=(0, 20))
@@ -65,6 +75,26 @@ class StepSource(ctk.CTkFrame):
         ctk.CTkButton(row, text="Parcourir…", command=self._browse, width=120).pack(
             side="right"
         )
+        ctk.CTkButton(row, text="Ajouter", command=self._add_typed_path, width=90).pack(
+            side="right", padx=(0, 10)
+        )
+
+        # Selected sources
+        sources_frame = ctk.CTkFrame(self)
+        sources_frame.pack(fill="x", padx=30, pady=10)
+
+        ctk.CTkLabel(
+            sources_frame,
+            text="Sources sélectionnées :",
+            font=ctk.CTkFont(size=14, weight="bold"),
+        ).pack(anchor="w", padx=15, pady=(10, 5))
+
+        self.sources_list_frame = ctk.CTkFrame(sources_frame, fg_color="transparent")
+        self.sources_list_frame.pack(fill="x", padx=15, pady=(0, 10))
+        self.no_sources_label = ctk.CTkLabel(
+            self.sources_list_frame, text="Aucune source.", text_color="gray"
+        )
+        self.no_sources_label.pack(anchor="w")
 
         # Info label
         self.info_label = ctk.CTkLabel(
@@ -72,10 +102,47 @@ class StepSource(ctk.CTkFrame):
         )
         self.info_label.pack(pady=15)
 
+        # On Linux, cards inserted from now on are picked up and scanned as
+        # soon as they mount; volumes already there are only listed.
+        self._watcher: MountWatcher | None = None
+        if platform.system() == "Linux":
+            self._watcher = MountWatcher(
+                lambda added, removed: self.after(
+                    0, lambda: self._on_mounts_changed(added, removed)
+                )
+            )
+            self._watcher.start()
+
+    def destroy(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+        super().destroy()
+
+    def _on_mounts_changed(self, added: list[MountPoint], removed: list[MountPoint]):
+        self._detect_devices()
+        self.state.drop_prescans(*(mount.path for mount in removed))
+        if self._manual:
+            return
+        for mount in removed:
+            if mount.path in self._auto_sources:
+                self._auto_sources.discard(mount.path)
+                self._remove_source(mount.path)
+        for mount in added:
+            if not self._is_destination(mount.path):
+                self._auto_sources.add(mount.path)
+                self._add_source(mount.path)
+                self.state.prescan(mount.path)
+
+    def _is_destination(self, path: str) -> bool:
+        """Whether path holds a chosen destination, e.g. a USB backup disk."""
+        root = Path(path).resolve()
+        for dest in (self.state.photo_dest, self.state.video_dest):
+            if dest and root in (Path(dest).resolve(), *Path(dest).resolve().parents):
+                return True
+        return False
+
     def on_enter(self):
         self._detect_devices()
-        if self.state.source_path:
-            self.path_var.set(self.state.source_path)
 
     def _detect_devices(self):
         for widget in self.devices_list_frame.winfo_children():
@@ -94,7 +161,7 @@ class StepSource(ctk.CTkFrame):
                     self.devices_list_frame,
                     text=f"📁  {label}  ({dev_path})",
                     anchor="w",
-                    command=lambda p=dev_path: self._select_path(p),
+                    command=lambda p=dev_path: self._pick_source(p),
                     fg_color="transparent",
                     border_width=1,
                     text_color=("gray10", "gray90"),
@@ -127,41 +194,113 @@ class StepSource(ctk.CTkFrame):
                     if vol.name == "Macintosh HD":
                         continue
                     drives.append((str(vol), vol.name))
+        elif system == "Linux":
+            drives = [(mount.path, mount.label) for mount in list_removable_mounts()]
         return drives
 
     def _browse(self):
         folder = filedialog.askdirectory(title="Sélectionner le dossier source")
         if folder:
-            self._select_path(folder)
+            self._pick_source(folder)
 
-    def _select_path(self, path: str):
-        self.path_var.set(path)
-        self.state.source_path = path
-        self._count_files(path)
+    def _add_typed_path(self):
+        path = self.path_var.get().strip()
+        if path:
+            self._pick_source(path)
 
-    def _count_files(self, path: str):
-        root = Path(path)
-        if not root.is_dir():
+    def _pick_source(self, path: str):
+        """Add a source chosen by the user, who then owns the selection."""
+        self._manual = True
+        self._add_source(path)
+
+    def _add_source(self, path: str):
+        path = os.path.normpath(path)
+        if not Path(path).is_dir():
             self.info_label.configure(text="⚠ Dossier introuvable.", text_color="red")
             return
+        if path in self.state.source_paths:
+            return
+        self.state.source_paths.append(path)
+        self.path_var.set("")
+        self.no_sources_label.pack_forget()
+
+        row = ctk.CTkFrame(self.sources_list_frame, fg_color="transparent")
+        row.pack(fill="x", pady=1)
+        label = ctk.CTkLabel(row, text=f"📁  {path}   (analyse…)", font=ctk.CTkFont(size=13))
+        label.pack(side="left", padx=5)
+        ctk.CTkButton(
+            row,
+            text="✕",
+            width=30,
+            fg_color="transparent",
+            hover_color=("gray80", "gray30"),
+            text_color="red",
+            command=lambda: self._drop_source(path),
+        ).pack(side="right")
+        self.source_rows[path] = label
+        self._count_files(path)
 
-        count = 0
-        for dirpath, _dirs, files in __import__("os").walk(root):
-            for f in files:
-                ext = __import__("os").path.splitext(f)[1].lower()
-                if ext in ALL_EXTENSIONS:
-                    count += 1
+    def _drop_source(self, path: str):
+        self._manual = True
+        self._remove_source(path)
 
+    def _remove_source(self, path: str):
+        if path not in self.state.source_paths:
+            return
+        self.state.source_paths.remove(path)
+        self.state.drop_prescans(path)
+        label = self.source_rows.pop(path)
+        label.master.destroy()
+        self.source_counts.pop(path, None)
+        if not self.state.source_paths:
+            self.no_sources_label.pack(anchor="w")
+        self._show_total()
+
+    def _count_files(self, path: str):
+        # Enumerate in the background; the listing is kept in the app state
+        # and reused by the grouping step.
+        self.info_label.configure(text="Analyse des sources…", text_color="gray")
+        future = self.state.listing_for(path)
+        future.add_done_callback(
+            lambda f: self.after(0, lambda: self._show_count(path, f))
+        )
+
+    def _show_count(self, path: str, future):
+        label = self.source_rows.get(path)
+        if label is None:
+            return
+        if future.exception() is not None:
+            self.source_counts[path] = None
+            label.configure(text=f"📁  {path}   (⚠ illisible)")
+        else:
+            self.source_counts[path] = count = len(future.result().entries)
+            label.configure(text=f"📁  {path}   ({count} fichier(s))")
+        self._show_total()
+
+    def _show_total(self):
+        paths = self.state.source_paths
+        if not paths:
+            self.info_label.configure(text="")
+            return
+        if any(p not in self.source_counts for p in paths):
+            return
+        if any(self.source_counts[p] is None for p in paths):
+            self.info_label.configure(text="⚠ Source illisible.", text_color="red")
+            return
+        count = sum(self.source_counts[p] for p in paths)
         self.info_label.configure(
-            text=f"✔ {count} fichier(s) photo/vidéo détecté(s).", text_color="#2FA572"
+            text=f"✔ {count} fichier(s) photo/vidéo dans {len(paths)} source(s).",
+            text_color="#2FA572",
         )
 
     def validate(self) -> bool:
-        path = self.path_var.get().strip()
-        if not path or not Path(path).is_dir():
+        if self.path_var.get().strip():
+            self._add_typed_path()
+        missing = [p for p in self.state.source_paths if not Path(p).is_dir()]
+        if not self.state.source_paths or missing:
             self.info_label.configure(
-                text="⚠ Veuillez sélectionner un dossier source valide.", text_color="red"
+                text="⚠ Veuillez sélectionner au moins une source valide.",
+                text_color="red",
             )
             return False
-        self.state.source_path = path
         return True
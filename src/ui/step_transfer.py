@@ -4,9 +4,29 @@ import threading
 
 import customtkinter as ctk
 
+from src.progress import ProgressSnapshot, TransferProgress
 from src.transfer import execute_transfer
 
 
+def _format_size(n: float) -> str:
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "o" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} To"
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} min {seconds:02d} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} h {minutes:02d} min"
+
+
 class StepTransfer(ctk.CTkFrame):
     def __init__(self, parent, state):
         super().__init__(parent, fg_color="transparent")
@@ -84,29 +104,55 @@ class StepTransfer(ctk.CTkFrame):
         threading.Thread(target=self._run_transfer, daemon=True).start()
 
     def _run_transfer(self):
-        def callback(current: int, total: int, filename: str):
-            progress = current / total if total > 0 else 1.0
-            self.after(0, lambda: self._update_progress(current, total, filename, progress))
-
-        result = execute_transfer(
-            groups=self.state.groups,
-            photo_dest=self.state.photo_dest,
-            video_dest=self.state.video_dest,
-            mode=self.state.transfer_mode,
-            callback=callback,
+        # Updates arrive at most ~10 times per second, however many files finish.
+        progress = TransferProgress(
+            lambda snapshot: self.after(0, lambda: self._update_progress(snapshot))
         )
 
+        try:
+            result = execute_transfer(
+                groups=self.state.groups,
+                photo_dest=self.state.photo_dest,
+                video_dest=self.state.video_dest,
+                mode=self.state.transfer_mode,
+                progress=progress,
+            )
+        except Exception as e:
+            # Reported like a per-file error, so the step never stays stuck.
+            result = {
+                "transferred": 0,
+                "skipped": 0,
+                "duplicates": 0,
+                "errors": [("Transfert", str(e))],
+            }
+
         self.after(0, lambda: self._on_complete(result))
 
-    def _update_progress(self, current: int, total: int, filename: str, progress: float):
-        self.progress_bar.set(progress)
-        self.progress_label.configure(text=f"{current} / {total} fichier(s)")
-        self.file_label.configure(text=filename)
+    def _update_progress(self, snapshot: ProgressSnapshot):
+        if snapshot.finished:
+            return
+        self.progress_bar.set(snapshot.fraction)
+        text = (
+            f"{snapshot.files_done} / {snapshot.files_total} fichier(s)   —   "
+            f"{_format_size(snapshot.bytes_done)} / {_format_size(snapshot.bytes_total)}"
+        )
+        if snapshot.rate:
+            text += f"   —   {_format_size(snapshot.rate)}/s"
+        if snapshot.eta is not None:
+            text += f"   —   reste {_format_duration(snapshot.eta)}"
+        self.progress_label.configure(text=text)
+        self.file_label.configure(text=snapshot.filename)
 
     def _on_complete(self, result: dict):
         self._running = False
         transferred = result["transferred"]
         errors = result["errors"]
+        already = result["skipped"] + result["duplicates"]
+        already_text = (
+            f" {already} fichier(s) déjà présent(s) à destination, ignoré(s)."
+            if already
+            else ""
+        )
 
         if errors:
             error_lines = "\n".join(f"  • {name}: {err}" for name, err in errors[:10])
@@ -114,13 +160,17 @@ class StepTransfer(ctk.CTkFrame):
             self.result_label.configure(
                 text=(
                     f"Transfert terminé : {transferred} fichier(s) transféré(s), "
-                    f"{len(errors)} erreur(s).\n\nErreurs :\n{error_lines}{extra}"
+                    f"{len(errors)} erreur(s).{already_text}\n\n"
+                    f"Erreurs :\n{error_lines}{extra}"
                 ),
                 text_color="orange",
             )
         else:
             self.result_label.configure(
-                text=f"✔ Transfert terminé avec succès ! {transferred} fichier(s) transféré(s).",
+                text=(
+                    f"✔ Transfert terminé avec succès ! {transferred} fichier(s) "
+                    f"transféré(s).{already_text}"
+                ),
                 text_color="#2FA572",
             )
 
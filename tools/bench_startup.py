@@ -0,0 +1,110 @@
+"""Measure SortIt startup time in fresh interpreters.
+
+Usage:
+    python tools/bench_startup.py [window|import|cli] [--repeats N] [--max-ms MS]
+
+"window" (default) times from process launch until the first window has
+been drawn: import src.app, build SortItApp and run one update(). It needs
+a display. "import" only imports src.app, and "cli" imports the headless
+entry point; both run anywhere. Each repeat is a new Python process, so
+module caches do not carry over, but the OS file cache does: run it once
+before trusting the numbers.
+
+With --max-ms the script exits with status 1 when the median exceeds the
+budget, so it can guard against startup regressions in CI.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Each child prints "<seconds since launch> <modules loaded>" on its last line.
+_CHILD = {
+    "window": """
+import sys, time
+from src.app import SortItApp
+app = SortItApp()
+app.update()
+print(time.time() - {launch}, len(sys.modules))
+app.destroy()
+""",
+    "import": """
+import sys, time
+import src.app
+print(time.time() - {launch}, len(sys.modules))
+""",
+    "cli": """
+import sys, time
+import src.cli
+print(time.time() - {launch}, len(sys.modules))
+""",
+}
+
+HEAVY_MODULES = ("PIL.JpegImagePlugin", "exifread", "multiprocessing", "src.ui.step_grouping")
+
+
+def run_once(mode: str) -> tuple[float, int]:
+    launch = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD[mode].format(launch=launch)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "failed")
+    seconds, modules = proc.stdout.strip().splitlines()[-1].split()
+    return float(seconds), int(modules)
+
+
+def loaded_heavy_modules(mode: str) -> list[str]:
+    """Heavy modules that a startup in this mode still imports."""
+    code = _CHILD[mode].format(launch=0).replace(
+        "print(time.time() - 0, len(sys.modules))",
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True
+    )
+    return proc.stdout.split()
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Time SortIt startup.")
+    parser.add_argument("mode", nargs="?", choices=sorted(_CHILD), default="window")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, help="fail if the median exceeds this")
+    args = parser.parse_args(argv[1:])
+
+    try:
+        run_once(args.mode)  # warm the OS file cache and bytecode
+        runs = [run_once(args.mode) for _ in range(args.repeats)]
+    except RuntimeError as e:
+        print(f"{args.mode}: child failed: {e}")
+        if args.mode == "window":
+            print("The window benchmark needs a display; try 'import' instead.")
+        return 2
+
+    times = [seconds * 1000 for seconds, _modules in runs]
+    median = statistics.median(times)
+    print(f"mode:     {args.mode}")
+    print(f"runs:     {len(times)}")
+    print(f"median:   {median:.0f} ms")
+    print(f"min/max:  {min(times):.0f} / {max(times):.0f} ms")
+    print(f"modules:  {runs[-1][1]}")
+    heavy = loaded_heavy_modules(args.mode)
+    print(f"heavy:    {', '.join(heavy) if heavy else 'none'}")
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"FAIL: median {median:.0f} ms exceeds {args.max_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,324 @@
+"""Benchmark scanning and transfer on a synthetic card, with JSON results.
+
+Usage:
+    python tools/bench_suite.py [--files N] [--work DIR] [--out FILE]
+                                [--only NAME ...] [--repeats N] [--compare OLD.json]
+
+Generates (or reuses) a card of N files with make_card.py under --work,
+then runs:
+
+    scan            scan_directory, no cache
+    scan_cached     scan_directory against a warm ScanCache
+    exif            extract_exif_date over every photo, one thread
+    exif_exifread   the exifread fallback on up to 2000 photos
+    transfer_copy   execute_transfer in copy mode, verified
+    transfer_copy_fast  copy mode without verification
+    transfer_move   execute_transfer in move mode, same filesystem
+    unique_path     DestinationIndex.unique_path with 0..1000 existing names,
+                    with a fresh index per call and with a shared one
+    memory          bytes retained per scanned file, in the FileStore and
+                    as materialized FileInfo objects
+
+Each benchmark keeps the best of --repeats runs. The OS file cache is
+warm after generation, so scan numbers reflect CPU and syscall cost, not
+a cold SD card. Results go to --out as JSON; --compare prints the ratio
+against an earlier results file.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from make_card import CardSpec, ensure_card  # noqa: E402
+from src.cache import ScanCache  # noqa: E402
+from src.scanner import (  # noqa: E402
+    Group,
+    _exifread_date,
+    classify_file,
+    extract_exif_date,
+    scan_directory,
+)
+from src.transfer import DestinationIndex, execute_transfer  # noqa: E402
+
+COLLISION_DEPTHS = (0, 10, 100, 1000)
+EXIFREAD_SAMPLE = 2000
+
+
+def best_of(repeats: int, run: Callable[[], None], setup: Callable[[], None] | None = None):
+    """Best and all wall-clock times of run(), calling setup() untimed before each."""
+    times = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times), times
+
+
+def _result(seconds: float, runs: list[float], files: int, nbytes: int = 0, **extra) -> dict:
+    result = {
+        "seconds": round(seconds, 6),
+        "runs": [round(t, 6) for t in runs],
+        "files": files,
+        "files_per_s": round(files / seconds, 1) if seconds else None,
+    }
+    if nbytes:
+        result["bytes"] = nbytes
+        result["mb_per_s"] = round(nbytes / seconds / 1e6, 1) if seconds else None
+    result.update(extra)
+    return result
+
+
+def _groups_per_day(files_by_date) -> list[Group]:
+    return [
+        Group(name="Bench", dates=[d], files=files)
+        for d, files in sorted(files_by_date.items())
+    ]
+
+
+def bench_scan(card: Path, work: Path, repeats: int) -> dict:
+    found = {}
+    seconds, runs = best_of(repeats, lambda: found.update(scan_directory(card)))
+    files = sum(len(v) for v in found.values())
+    return _result(seconds, runs, files, dates=len(found))
+
+
+def bench_scan_cached(card: Path, work: Path, repeats: int) -> dict:
+    db = work / "bench_cache.sqlite"
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{db}{suffix}").unlink(missing_ok=True)
+    with ScanCache(db) as cache:
+        found = scan_directory(card, cache=cache)  # populate
+        seconds, runs = best_of(repeats, lambda: scan_directory(card, cache=cache))
+    return _result(seconds, runs, sum(len(v) for v in found.values()))
+
+
+def _photo_paths(card: Path) -> list[Path]:
+    return [
+        p for p in card.rglob("*") if p.is_file() and classify_file(p.suffix) == "photo"
+    ]
+
+
+def bench_exif(card: Path, work: Path, repeats: int) -> dict:
+    paths = _photo_paths(card)
+    dated = 0
+
+    def run():
+        nonlocal dated
+        dated = sum(1 for p in paths if extract_exif_date(p) is not None)
+
+    seconds, runs = best_of(repeats, run)
+    return _result(seconds, runs, len(paths), dated=dated)
+
+
+def bench_exif_exifread(card: Path, work: Path, repeats: int) -> dict:
+    paths = _photo_paths(card)[:EXIFREAD_SAMPLE]
+    seconds, runs = best_of(repeats, lambda: [_exifread_date(p) for p in paths])
+    return _result(seconds, runs, len(paths))
+
+
+def _bench_transfer(card: Path, work: Path, repeats: int, mode: str, verify: bool) -> dict:
+    dest = work / f"dest_{mode}"
+    source = work / "move_source" if mode == "move" else card
+    files_by_date = {}
+    outcome = {}
+
+    def setup():
+        shutil.rmtree(dest, ignore_errors=True)
+        if mode == "move":
+            shutil.rmtree(source, ignore_errors=True)
+            shutil.copytree(card, source)
+        files_by_date.clear()
+        files_by_date.update(scan_directory(source))
+
+    def run():
+        outcome.update(
+            execute_transfer(
+                _groups_per_day(files_by_date), dest, dest, mode, resume=True, verify=verify
+            )
+        )
+
+    seconds, runs = best_of(repeats, run, setup)
+    files = [f for v in files_by_date.values() for f in v]
+    shutil.rmtree(dest, ignore_errors=True)
+    if mode == "move":
+        shutil.rmtree(source, ignore_errors=True)
+    return _result(
+        seconds,
+        runs,
+        len(files),
+        sum(f.size for f in files),
+        transferred=outcome.get("transferred"),
+        errors=len(outcome.get("errors", [])),
+    )
+
+
+def bench_transfer_copy(card: Path, work: Path, repeats: int) -> dict:
+    return _bench_transfer(card, work, repeats, "copy", verify=True)
+
+
+def bench_transfer_copy_fast(card: Path, work: Path, repeats: int) -> dict:
+    return _bench_transfer(card, work, repeats, "copy", verify=False)
+
+
+def bench_transfer_move(card: Path, work: Path, repeats: int) -> dict:
+    return _bench_transfer(card, work, repeats, "move", verify=False)
+
+
+def bench_unique_path(card: Path, work: Path, repeats: int) -> dict:
+    folder = work / "collisions"
+    shutil.rmtree(folder, ignore_errors=True)
+    folder.mkdir(parents=True)
+    (folder / "DSC_0001.JPG").touch()
+    results = {}
+    made = 0
+    for depth in COLLISION_DEPTHS:
+        while made < depth:
+            made += 1
+            (folder / f"DSC_0001_{made}.JPG").touch()
+        target = folder / "DSC_0001.JPG"
+        calls = 200
+        # A fresh index per call lists the folder and walks the names each
+        # time; a shared one answers from its listing and suffix memo.
+        disk, _ = best_of(
+            repeats, lambda: [DestinationIndex().unique_path(target) for _ in range(calls)]
+        )
+
+        def indexed():
+            index = DestinationIndex()
+            for _ in range(calls):
+                index.unique_path(target)
+
+        memory, _ = best_of(repeats, indexed)
+        results[str(depth)] = {
+            "disk_us_per_call": round(disk / calls * 1e6, 2),
+            "index_us_per_call": round(memory / calls * 1e6, 2),
+        }
+    shutil.rmtree(folder, ignore_errors=True)
+    return {"collisions": results}
+
+
+def bench_memory(card: Path, work: Path, repeats: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        files_by_date = scan_directory(card, workers=1)
+        gc.collect()
+        stored = tracemalloc.get_traced_memory()[0] - base
+        # What the same files cost as objects, with each path's string
+        # cached the way any consumer of FileInfo.path ends up doing.
+        infos = [f for files in files_by_date.values() for f in files]
+        for info in infos:
+            os.fspath(info.path)
+        gc.collect()
+        materialized = tracemalloc.get_traced_memory()[0] - base - stored
+    finally:
+        tracemalloc.stop()
+    files = len(infos)
+    return {
+        "files": files,
+        "store_bytes_per_file": round(stored / files, 1) if files else None,
+        "fileinfo_bytes_per_file": round(materialized / files, 1) if files else None,
+    }
+
+
+BENCHMARKS: dict[str, Callable[[Path, Path, int], dict]] = {
+    "scan": bench_scan,
+    "scan_cached": bench_scan_cached,
+    "exif": bench_exif,
+    "exif_exifread": bench_exif_exifread,
+    "transfer_copy": bench_transfer_copy,
+    "transfer_copy_fast": bench_transfer_copy_fast,
+    "transfer_move": bench_transfer_move,
+    "unique_path": bench_unique_path,
+    "memory": bench_memory,
+}
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, previous: dict) -> None:
+    """Print how each benchmark's best time changed against a previous run."""
+    for name, result in current["results"].items():
+        old = previous.get("results", {}).get(name, {})
+        if "seconds" in result and old.get("seconds"):
+            ratio = result["seconds"] / old["seconds"]
+            before, after = old["seconds"], result["seconds"]
+            print(f"  {name:20s} {before:9.4f}s -> {after:9.4f}s  x{ratio:.2f}")
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="SortIt benchmark suite.")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--work", default=os.path.join(tempfile.gettempdir(), "sortit_bench"))
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=None)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args(argv[1:])
+
+    work = Path(args.work)
+    work.mkdir(parents=True, exist_ok=True)
+    card = work / f"card_{args.files}_{args.seed}"
+    summary = ensure_card(card, CardSpec(files=args.files, seed=args.seed))
+    print(f"card: {card} ({sum(summary.counts.values())} files, {summary.dates} dates)")
+
+    results = {}
+    for name in args.only or BENCHMARKS:
+        print(f"{name} ...", flush=True)
+        results[name] = BENCHMARKS[name](card, work, args.repeats)
+        print(f"  {json.dumps(results[name])}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeats": args.repeats,
+            "card": {"files": args.files, "seed": args.seed, "counts": summary.counts},
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {args.out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,79 @@
+"""Check the native EXIF date parser against exifread on a folder of photos.
+
+Usage:
+    python tools/compare_dates.py <folder>
+
+Every file in PHOTO_EXTENSIONS under the folder is parsed both ways. Any
+disagreement is printed, and the exit status is 1 if there was one.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.metadata import EXIF_DATE_FORMAT, MetadataError, read_exif_datetime  # noqa: E402
+from src.scanner import PHOTO_EXTENSIONS, _exifread_date  # noqa: E402
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) != 2:
+        print(__doc__.strip())
+        return 2
+
+    files = [
+        Path(root) / name
+        for root, _dirs, names in os.walk(argv[1])
+        for name in names
+        if os.path.splitext(name)[1].lower() in PHOTO_EXTENSIONS
+    ]
+
+    # Warm the page cache and strptime's lazy setup so neither parser pays
+    # one-off costs inside its timing.
+    datetime.strptime("2000:01:01 00:00:00", EXIF_DATE_FORMAT)
+    for path in files:
+        with open(path, "rb") as f:
+            f.read(1 << 20)
+
+    native: dict[Path, object] = {}
+    start = time.perf_counter()
+    for path in files:
+        try:
+            dt = read_exif_datetime(path)
+            native[path] = dt.date() if dt else None
+        except (MetadataError, OSError) as e:
+            native[path] = e
+    native_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = {path: _exifread_date(path) for path in files}
+    exifread_time = time.perf_counter() - start
+
+    mismatches = 0
+    unsupported = 0
+    for path in files:
+        got = native[path]
+        if isinstance(got, Exception):
+            unsupported += 1
+            print(f"fallback  {path}: {got}")
+        elif got != reference[path]:
+            mismatches += 1
+            print(f"MISMATCH  {path}: native={got} exifread={reference[path]}")
+
+    n = max(len(files), 1)
+    print(
+        f"{len(files)} file(s), {mismatches} mismatch(es), "
+        f"{unsupported} handed to exifread"
+    )
+    print(
+        f"native {native_time / n * 1e6:.0f} µs/file, "
+        f"exifread {exifread_time / n * 1e6:.0f} µs/file"
+    )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,306 @@
+"""Generate a synthetic memory card for benchmarks.
+
+Usage:
+    python tools/make_card.py <dest_dir> [files] [--seed N] [--days N] ...
+
+Writes a DCF-style layout (DCIM/100NIKON, 100APPLE, 100MSDCF and a Sony
+PRIVATE/M4ROOT/CLIP folder) with:
+
+- JPEGs carrying an EXIF DateTimeOriginal in their APP1 segment,
+- TIFF-based RAWs (.NEF, .ARW in both byte orders), some paired with a
+  same-stem JPEG,
+- MP4s with the date in moov/mvhd and MOVs that also carry the QuickTime
+  creationdate key, with moov either before or after mdat,
+- JPEGs without EXIF, whose date comes from the file mtime,
+- a sprinkling of sidecar files the scanner must ignore.
+
+Files are built byte by byte (no image encoder), so a million-file card
+takes minutes, not hours. Capture times run in sessions over --days
+shooting days, and every file's mtime is set to its capture time. Image
+data is random filler: the files parse, they do not decode.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import struct
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+
+MANIFEST_NAME = ".synthetic_card.json"
+_MAC_EPOCH_OFFSET = 2_082_844_800  # seconds from 1904-01-01 to 1970-01-01
+_FILLER = random.Random(0).randbytes(4 * 1024 * 1024)
+
+
+@dataclass
+class CardSpec:
+    files: int = 1000
+    seed: int = 1
+    days: int = 0  # 0: one shooting day per ~300 files
+    start: str = "2024-01-06"
+    per_folder: int = 999
+    video_ratio: float = 0.08
+    raw_ratio: float = 0.25
+    pair_ratio: float = 0.5
+    no_exif_ratio: float = 0.03
+    noise_ratio: float = 0.02
+    jpeg_kb: int = 8
+    raw_kb: int = 24
+    video_kb: int = 128
+
+
+@dataclass
+class CardSummary:
+    spec: CardSpec
+    counts: dict[str, int] = field(default_factory=dict)
+    dates: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+
+# --- Byte builders ---
+
+
+def _filler(size: int, serial: int) -> bytes:
+    """size bytes of incompressible data, unique to serial."""
+    tag = struct.pack(">Q", serial)
+    if size <= len(tag):
+        return tag[:size]
+    n = size - len(tag)
+    if n < len(_FILLER):
+        start = (serial * 7919) % (len(_FILLER) - n)
+        return _FILLER[start:start + n] + tag
+    return (_FILLER * (n // len(_FILLER) + 1))[:n] + tag
+
+
+def tiff_exif(dt: datetime, little_endian: bool = True) -> bytes:
+    """A TIFF header, IFD0 and Exif IFD holding DateTimeOriginal."""
+    e = "<" if little_endian else ">"
+    stamp = dt.strftime("%Y:%m:%d %H:%M:%S").encode("ascii") + b"\0"
+    exif_off = 8 + 2 + 2 * 12 + 4
+    date_off = exif_off + 2 + 12 + 4
+    out = (b"II" if little_endian else b"MM") + struct.pack(e + "HI", 42, 8)
+    out += struct.pack(e + "H", 2)
+    out += struct.pack(e + "HHII", 0x0100, 4, 1, 6000)  # ImageWidth
+    out += struct.pack(e + "HHII", 0x8769, 4, 1, exif_off)  # ExifIFD
+    out += struct.pack(e + "I", 0)
+    out += struct.pack(e + "H", 1)
+    out += struct.pack(e + "HHII", 0x9003, 2, len(stamp), date_off)
+    out += struct.pack(e + "I", 0)
+    return out + stamp
+
+
+def jpeg_bytes(dt: datetime | None, size: int, serial: int) -> bytes:
+    """A JPEG-shaped file, with an EXIF APP1 segment unless dt is None."""
+    if dt is None:
+        app = b"JFIF\0\x01\x01\0\0\x01\0\x01\0\0"
+        head = b"\xff\xd8\xff\xe0" + struct.pack(">H", len(app) + 2) + app
+    else:
+        app = b"Exif\0\0" + tiff_exif(dt)
+        head = b"\xff\xd8\xff\xe1" + struct.pack(">H", len(app) + 2) + app
+    # Start of scan: parsers stop looking for metadata here.
+    head += b"\xff\xda\x00\x08\x01\x01\x00\x00\x3f\x00"
+    return head + _filler(max(size - len(head) - 2, 8), serial) + b"\xff\xd9"
+
+
+def raw_bytes(dt: datetime, size: int, serial: int, little_endian: bool = True) -> bytes:
+    head = tiff_exif(dt, little_endian)
+    return head + _filler(max(size - len(head), 8), serial)
+
+
+def _atom(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def _quicktime_meta(dt: datetime) -> bytes:
+    key = b"com.apple.quicktime.creationdate"
+    value = dt.astimezone().strftime("%Y-%m-%dT%H:%M:%S%z").encode("ascii")
+    entry = struct.pack(">I4s", 8 + len(key), b"mdta") + key
+    keys = _atom(b"keys", b"\0\0\0\0" + struct.pack(">I", 1) + entry)
+    data = _atom(b"data", struct.pack(">II", 1, 0) + value)
+    ilst = _atom(b"ilst", _atom(struct.pack(">I", 1), data))
+    hdlr = _atom(b"hdlr", b"\0" * 8 + b"mdta" + b"\0" * 13)
+    return _atom(b"meta", hdlr + keys + ilst)
+
+
+def video_bytes(
+    dt: datetime, size: int, serial: int, quicktime: bool, moov_last: bool
+) -> bytes:
+    """An MP4/MOV with mvhd creation time and optionally the QuickTime key."""
+    seconds = int(time.mktime(dt.timetuple())) + _MAC_EPOCH_OFFSET
+    header = struct.pack(">IIII", seconds, seconds, 600, 6000)
+    mvhd = _atom(b"mvhd", b"\0\0\0\0" + header + b"\0" * 80)
+    moov = _atom(b"moov", mvhd + (_quicktime_meta(dt) if quicktime else b""))
+    brands = b"qt  \0\0\0\0qt  " if quicktime else b"isom\0\0\x02\0isomiso2mp41"
+    ftyp = _atom(b"ftyp", brands)
+    mdat_size = max(size - len(ftyp) - len(moov) - 8, 8)
+    mdat = _atom(b"mdat", _filler(mdat_size, serial))
+    return ftyp + (mdat + moov if moov_last else moov + mdat)
+
+
+# --- Layout ---
+
+
+class _Camera:
+    """Hands out DCF folder and file names for one camera."""
+
+    def __init__(
+        self, root: Path, folder_suffix: str, prefix: str, digits: int, per_folder: int
+    ):
+        self.root = root
+        self.folder_suffix = folder_suffix
+        self.prefix = prefix
+        self.digits = digits
+        self.per_folder = per_folder
+        self.folder = 100
+        self.in_folder = 0
+        self.number = 0
+
+    def next_stem(self) -> tuple[Path, str]:
+        if self.in_folder >= self.per_folder:
+            self.folder = 100 if self.folder >= 999 else self.folder + 1
+            self.in_folder = 0
+        self.in_folder += 1
+        # DCF file numbers wrap, which is what makes names collide on import.
+        self.number = self.number % (10 ** self.digits - 1) + 1
+        folder = self.root / "DCIM" / f"{self.folder}{self.folder_suffix}"
+        return folder, f"{self.prefix}{self.number:0{self.digits}d}"
+
+
+def _timeline(spec: CardSpec, rng: random.Random) -> list[datetime]:
+    """Capture times in increasing order, grouped in sessions over spec.days days."""
+    days = spec.days or max(1, spec.files // 300)
+    day = datetime.fromisoformat(spec.start)
+    times = []
+    for d in range(days):
+        count = spec.files * (d + 1) // days - spec.files * d // days
+        t = day.replace(hour=rng.randint(7, 12), minute=rng.randrange(60))
+        end_of_day = day.replace(hour=23, minute=59, second=0)
+        for _ in range(count):
+            times.append(t)
+            step = timedelta(seconds=rng.randint(1, 40))
+            if rng.random() < 0.01:
+                step = timedelta(hours=rng.randint(1, 4))  # new session
+            t = min(t + step, end_of_day)
+        day += timedelta(days=rng.choice((1, 1, 2, 3, 7)))
+    return times
+
+
+def generate(dest: str | Path, spec: CardSpec) -> CardSummary:
+    """Write a synthetic card into dest and return what was written."""
+    started = time.perf_counter()
+    root = Path(dest)
+    rng = random.Random(spec.seed)
+    summary = CardSummary(spec=spec)
+    counts = summary.counts
+    made_dirs: set[Path] = set()
+
+    nikon = _Camera(root, "NIKON", "DSC_", 4, spec.per_folder)
+    apple = _Camera(root, "APPLE", "IMG_", 4, spec.per_folder)
+    sony = _Camera(root, "MSDCF", "DSC", 5, spec.per_folder)
+    clip_dir = root / "PRIVATE" / "M4ROOT" / "CLIP"
+    clip_number = 0
+
+    def write(path: Path, data: bytes, dt: datetime, kind: str) -> None:
+        if path.parent not in made_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            made_dirs.add(path.parent)
+        with open(path, "wb") as f:
+            f.write(data)
+        stamp = time.mktime(dt.timetuple())
+        os.utime(path, (stamp, stamp))
+        counts[kind] = counts.get(kind, 0) + 1
+        summary.bytes += len(data)
+
+    jpeg_size = spec.jpeg_kb * 1024
+    raw_size = spec.raw_kb * 1024
+    video_size = spec.video_kb * 1024
+    times = _timeline(spec, rng)
+    serial = 0
+    i = 0
+    while i < spec.files:
+        dt = times[i]
+        serial += 1
+        roll = rng.random()
+        if roll < spec.video_ratio:
+            if rng.random() < 0.5:
+                folder, stem = apple.next_stem()
+                data = video_bytes(dt, video_size, serial, quicktime=True, moov_last=True)
+                write(folder / f"{stem}.MOV", data, dt, "mov")
+            else:
+                clip_number += 1
+                data = video_bytes(dt, video_size, serial, quicktime=False, moov_last=False)
+                write(clip_dir / f"C{clip_number:04d}.MP4", data, dt, "mp4")
+        elif roll < spec.video_ratio + spec.raw_ratio:
+            camera, ext = (nikon, "NEF") if rng.random() < 0.7 else (sony, "ARW")
+            folder, stem = camera.next_stem()
+            little = ext != "ARW" or rng.random() < 0.5
+            write(folder / f"{stem}.{ext}", raw_bytes(dt, raw_size, serial, little), dt, "raw")
+            if rng.random() < spec.pair_ratio and i + 1 < spec.files:
+                serial += 1
+                i += 1
+                write(folder / f"{stem}.JPG", jpeg_bytes(dt, jpeg_size, serial), dt, "jpeg")
+        elif roll < spec.video_ratio + spec.raw_ratio + spec.no_exif_ratio:
+            folder, stem = nikon.next_stem()
+            data = jpeg_bytes(None, jpeg_size, serial)
+            write(folder / f"{stem}.JPG", data, dt, "jpeg_no_exif")
+        else:
+            camera = nikon if rng.random() < 0.6 else apple
+            folder, stem = camera.next_stem()
+            write(folder / f"{stem}.JPG", jpeg_bytes(dt, jpeg_size, serial), dt, "jpeg")
+        if rng.random() < spec.noise_ratio:
+            folder, stem = apple.next_stem()
+            write(folder / f"{stem}.AAE", b"<?xml version='1.0'?><plist/>", dt, "ignored")
+        i += 1
+
+    summary.dates = len({t.date() for t in times})
+    summary.seconds = time.perf_counter() - started
+    with open(root / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(asdict(summary), f, indent=2)
+    return summary
+
+
+def load_summary(dest: str | Path) -> CardSummary | None:
+    """Summary of a card generated earlier into dest, if any."""
+    try:
+        with open(Path(dest) / MANIFEST_NAME, encoding="utf-8") as f:
+            data = json.load(f)
+        return CardSummary(**{**data, "spec": CardSpec(**data["spec"])})
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def ensure_card(dest: str | Path, spec: CardSpec) -> CardSummary:
+    """Reuse the card in dest if it was generated from spec, else rebuild it."""
+    existing = load_summary(dest)
+    if existing is not None and existing.spec == spec:
+        return existing
+    if existing is not None:
+        shutil.rmtree(dest)
+    elif Path(dest).exists() and any(Path(dest).iterdir()):
+        raise FileExistsError(f"{dest} is not empty and was not generated by this tool")
+    return generate(dest, spec)
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic memory card.")
+    parser.add_argument("dest")
+    parser.add_argument("files", nargs="?", type=int, default=CardSpec.files)
+    for name, default in asdict(CardSpec()).items():
+        if name != "files":
+            flag = f"--{name.replace('_', '-')}"
+            parser.add_argument(flag, type=type(default), default=default)
+    args = vars(parser.parse_args(argv[1:]))
+    dest = args.pop("dest")
+    summary = ensure_card(dest, CardSpec(**args))
+    print(json.dumps(asdict(summary), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))